@@ -0,0 +1,160 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from .bellman_ford import JohnsonIndex, NegativeCycleError, reweight
+from .dijkstra import dijkstra
+from .path_solver import SolveError
+
+# Floyd-Warshall is O(V^3) but fully vectorised, so it wins on small dense
+# graphs; everything else runs one Dijkstra per source node, on Johnson
+# reweighted edges when some weights are negative.
+FLOYD_WARSHALL_MAX_NODES = 400
+FLOYD_WARSHALL_MIN_DENSITY = 0.05
+# Below this many nodes the process pool costs more than it saves
+PROCESS_POOL_MIN_NODES = 300
+# dist + pred take 12 bytes per pair, so cap the index at ~300 MB
+MAX_NODES = 5000
+
+_worker_csr = None
+
+
+def _init_worker(csr):
+    global _worker_csr
+    _worker_csr = csr
+
+
+def _one_to_all_rows(sources, cancelled=None):
+    """Run Dijkstra from each source id; returns a list of (source, dist, pred)
+    rows, or None once cancelled() is true"""
+    n = _worker_csr.num_nodes
+    rows = []
+    for s in sources:
+        if cancelled is not None and cancelled():
+            return None
+        dist_row = np.full(n, np.inf)
+        pred_row = np.full(n, -1, dtype=np.int32)
+        dist, pred = dijkstra(_worker_csr, s)
+        reached = np.fromiter(dist.keys(), dtype=np.int64, count=len(dist))
+        dist_row[reached] = np.fromiter(dist.values(), dtype=np.float64, count=len(dist))
+        pred_row[reached] = np.fromiter((pred[node] for node in dist), dtype=np.int32, count=len(dist))
+        rows.append((s, dist_row, pred_row))
+    return rows
+
+
+class AllPairsIndex:
+    """Distance and predecessor matrices for every (start, end) pair of a graph"""
+
+    def __init__(self, nodes, dist, pred):
+        self.nodes = nodes
+        self.index = {node: i for i, node in enumerate(nodes)}
+        self.dist = dist    # dist[i, j]: shortest distance from node i to node j
+        self.pred = pred    # pred[i, j]: node before j on the i -> j path, -1 if none
+
+    @classmethod
+    def build(cls, graph, workers=None, worker=None):
+        """Index every pair of graph; None if worker (a SolveWorker) is cancelled.
+
+        Raises ValueError past MAX_NODES and SolveError if the graph has a
+        negative cycle.
+        """
+        nodes = list(graph.nodes)
+        n = len(nodes)
+        if n > MAX_NODES:
+            raise ValueError(f"All-pairs index is limited to {MAX_NODES} nodes (graph has {n}).")
+        m = graph.number_of_edges()
+        if n <= FLOYD_WARSHALL_MAX_NODES and m >= FLOYD_WARSHALL_MIN_DENSITY * n * n:
+            dist, pred = floyd_warshall(n, *graph.edge_arrays(), worker=worker)
+            if dist is None:
+                return None
+            if (np.diagonal(dist) < 0).any():
+                raise SolveError("The graph has a negative cycle, so shortest paths are undefined.")
+        elif graph.min_weight() is not None and graph.min_weight() < 0:
+            # Dijkstra needs non-negative weights: run it on w + h[u] - h[v],
+            # then shift every i -> j distance back by h[j] - h[i]
+            try:
+                johnson = JohnsonIndex.build(graph, worker=worker)
+            except NegativeCycleError:
+                raise SolveError("The graph has a negative cycle, so shortest paths are undefined.")
+            if johnson is None:
+                return None
+            h = johnson.potentials
+            dist, pred = one_to_all(reweight(graph.csr(), h, forward=True), workers, worker)
+            if dist is None:
+                return None
+            dist += h[None, :] - h[:, None]
+        else:
+            dist, pred = one_to_all(graph.csr(), workers, worker)
+            if dist is None:
+                return None
+        return cls(nodes, dist, pred)
+
+    def path(self, start, end):
+        """Return (cost, path) for a pair in O(path length), or (None, None) if unreachable"""
+        i, j = self.index[start], self.index[end]
+        cost = self.dist[i, j]
+        if not np.isfinite(cost):
+            return None, None
+        path = [end]
+        while j != i:
+            j = self.pred[i, j]
+            path.append(self.nodes[j])
+        path.reverse()
+        return float(cost), path
+
+
+def floyd_warshall(n, src, dst, weight, worker=None):
+    """Vectorised Floyd-Warshall over an edge list; returns (dist, pred)
+    matrices, or (None, None) if worker is cancelled"""
+    dist = np.full((n, n), np.inf)
+    pred = np.full((n, n), -1, dtype=np.int32)
+    dist[src, dst] = weight
+    pred[src, dst] = src
+    np.fill_diagonal(dist, 0)
+
+    for k in range(n):
+        if worker is not None and worker.cancelled:
+            return None, None
+        # Relax every pair through k at once: dist[i, k] + dist[k, j]
+        through_k = dist[:, k:k + 1] + dist[k:k + 1, :]
+        better = through_k < dist
+        dist = np.where(better, through_k, dist)
+        pred = np.where(better, pred[k], pred)
+    return dist, pred
+
+
+def one_to_all(csr, workers=None, worker=None):
+    """One Dijkstra per source, fanned out over a process pool for larger
+    graphs; returns (dist, pred), or (None, None) if worker is cancelled"""
+    n = csr.num_nodes
+    dist = np.empty((n, n))
+    pred = np.empty((n, n), dtype=np.int32)
+    cancelled = (lambda: worker.cancelled) if worker is not None else None
+
+    if n < PROCESS_POOL_MIN_NODES or workers == 1:
+        _init_worker(csr)
+        batches = [_one_to_all_rows(range(n), cancelled)]
+        _init_worker(None)
+        if batches[0] is None:
+            return None, None
+    else:
+        workers = workers or os.cpu_count() or 1
+        # A few chunks per worker keeps the pool busy without per-source overhead;
+        # the CSR arrays are shipped once per worker through the initializer
+        chunk = max(1, n // (workers * 4))
+        chunks = [range(s, min(s + chunk, n)) for s in range(0, n, chunk)]
+        batches = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(csr,)) as pool:
+            # Cancel is checked as each chunk comes back; the chunks still
+            # queued are dropped, the few running ones are left to finish
+            for rows in pool.map(_one_to_all_rows, chunks):
+                if cancelled is not None and cancelled():
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return None, None
+                batches.append(rows)
+
+    for rows in batches:
+        for s, dist_row, pred_row in rows:
+            dist[s] = dist_row
+            pred[s] = pred_row
+    return dist, pred
@@ -0,0 +1,181 @@
+"""Headless batch runner: answer many (start, end) queries on one graph.
+
+    python -m probleme1.batch graph.csv pairs.csv results.csv [--workers N]
+
+The graph's forward and reverse CSR arrays are copied once into shared
+memory; worker processes map them instead of receiving a pickled graph per
+task. Pairs go out in chunks and result rows are written as soon as each
+chunk completes, so the output grows while the batch runs and memory stays
+flat however many pairs there are.
+"""
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+import numpy as np
+from .bellman_ford import JohnsonIndex, NegativeCycleError
+from .dijkstra import bidirectional_dijkstra
+from .graph_core import CSR
+from .graph_io import load_graph_file
+
+# Pairs per task: enough to amortise the round trip to a worker process
+CHUNK_PAIRS = 64
+# Chunks queued per worker, so no worker idles while results are written
+CHUNKS_IN_FLIGHT = 4
+# Separator between node names in the path column
+PATH_SEPARATOR = ";"
+RESULT_HEADER = ("index", "start", "end", "cost", "path", "seconds", "error")
+
+
+class BatchReport:
+    """Outcome of run_batch: query counts and wall time"""
+
+    def __init__(self):
+        self.solved = 0
+        self.unreachable = 0
+        self.invalid = 0
+        self.seconds = 0.0
+
+    def summary(self):
+        total = self.solved + self.unreachable + self.invalid
+        rate = total / self.seconds if self.seconds else 0.0
+        return (f"{total} queries in {self.seconds:.2f} s ({rate:.0f}/s): {self.solved} solved, "
+                f"{self.unreachable} unreachable, {self.invalid} invalid")
+
+
+def read_pairs(path):
+    """Yield (index, start, end) for every row of an OD-pairs CSV; index is the row number"""
+    with open(path, newline='') as f:
+        for index, row in enumerate(csv.reader(f)):
+            if len(row) >= 2:
+                yield index, row[0].strip(), row[1].strip()
+
+
+def run_batch(graph_path, pairs_path, output_path, workers=None, chunk_pairs=CHUNK_PAIRS):
+    """Solve every pair of pairs_path on the graph at graph_path into output_path.
+
+    Rows are written in completion order with the pair's row number as
+    index; pairs naming unknown nodes get an error instead of a cost.
+    Negative weights are reweighted once (Johnson) so every query stays a
+    bidirectional Dijkstra; a negative cycle raises ValueError naming it.
+    Returns a BatchReport.
+    """
+    started = time.perf_counter()
+    graph, _ = load_graph_file(graph_path)
+    csr, reverse = graph.csr(), graph.reverse_csr()
+    potentials = np.zeros(graph.number_of_nodes())
+    if graph.min_weight() is not None and graph.min_weight() < 0:
+        try:
+            johnson = JohnsonIndex.build(graph)
+        except NegativeCycleError as e:
+            cycle = " → ".join(graph.names[node] for node in e.cycle)
+            raise ValueError(f"{e} Cycle: {cycle}") from e
+        csr, reverse, potentials = johnson.csr, johnson.reverse, johnson.potentials
+    workers = workers or os.cpu_count() or 1
+    report = BatchReport()
+
+    blocks = []
+    try:
+        specs = {}
+        shared = {f"{prefix}_{key}": getattr(arrays, key)
+                  for prefix, arrays in (('forward', csr), ('reverse', reverse))
+                  for key in ('offsets', 'targets', 'weights')}
+        shared['potentials'] = potentials
+        for key, array in shared.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            specs[key] = (block.name, array.dtype.str, array.shape)
+
+        with open(output_path, 'w', newline='') as out, \
+                ProcessPoolExecutor(workers, initializer=_attach, initargs=(specs,)) as pool:
+            writer = csv.writer(out)
+            writer.writerow(RESULT_HEADER)
+            names = graph.names
+            pending = set()
+
+            def write(rows):
+                for index, start, end, cost, path, seconds in rows:
+                    if path is None:
+                        report.unreachable += 1
+                        writer.writerow((index, start, end, "", "", f"{seconds:.6f}", "unreachable"))
+                    else:
+                        report.solved += 1
+                        route = PATH_SEPARATOR.join(names[node] for node in path)
+                        writer.writerow((index, start, end, cost, route, f"{seconds:.6f}", ""))
+                out.flush()
+
+            def drain():
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    write(future.result())
+
+            chunk = []
+            for index, start, end in read_pairs(pairs_path):
+                if start not in graph.ids or end not in graph.ids:
+                    report.invalid += 1
+                    writer.writerow((index, start, end, "", "", "", "unknown node"))
+                    continue
+                chunk.append((index, start, end, graph.ids[start], graph.ids[end]))
+                if len(chunk) == chunk_pairs:
+                    pending.add(pool.submit(_solve_chunk, chunk))
+                    chunk = []
+                    if len(pending) >= workers * CHUNKS_IN_FLIGHT:
+                        drain()
+            if chunk:
+                pending.add(pool.submit(_solve_chunk, chunk))
+            while pending:
+                drain()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+# -- worker side ---------------------------------------------------------
+
+_shared = {}  # Per worker process: the attached blocks and the CSR views over them
+
+
+def _attach(specs):
+    arrays = {}
+    blocks = []
+    for key, (name, dtype, shape) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)  # Keep the mapping alive as long as the process
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    _shared['blocks'] = blocks
+    _shared['csr'] = CSR(arrays['forward_offsets'], arrays['forward_targets'], arrays['forward_weights'], None)
+    _shared['reverse'] = CSR(arrays['reverse_offsets'], arrays['reverse_targets'], arrays['reverse_weights'], None)
+    _shared['potentials'] = arrays['potentials']
+
+
+def _solve_chunk(chunk):
+    csr, reverse, potentials = _shared['csr'], _shared['reverse'], _shared['potentials']
+    rows = []
+    for index, start, end, source, target in chunk:
+        started = time.perf_counter()
+        cost, path = bidirectional_dijkstra(csr, reverse, source, target)
+        if path is not None:
+            cost += float(potentials[target] - potentials[source])  # Undo the reweighting
+        rows.append((index, start, end, cost, path, time.perf_counter() - started))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve many shortest-path queries on one graph.")
+    parser.add_argument("graph", help="graph file (.csv or .npgraph)")
+    parser.add_argument("pairs", help="CSV of start,end node names, one query per row")
+    parser.add_argument("output", help="CSV to write results to")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+    print(run_batch(args.graph, args.pairs, args.output, args.workers).summary())
+
+
+if __name__ == "__main__":
+    main()
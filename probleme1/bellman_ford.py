@@ -0,0 +1,158 @@
+from collections import deque
+from math import inf
+import numpy as np
+from .dijkstra import bidirectional_dijkstra, trace_path
+from .graph_core import CSR
+
+# Label-correcting searches for graphs with negative weights (rebates).
+# Queue-based Bellman-Ford (SPFA) only rescans nodes whose label improved
+# and stops as soon as the queue empties, instead of running n - 1 full
+# passes. Negative cycles are caught by looking for a cycle in the
+# predecessor graph after every n relaxations: such a cycle always has
+# negative weight, and one must appear once labels drop below every simple
+# path's weight, so the search stops with the cycle in hand instead of
+# relaxing around it forever.
+
+# Relaxations between two cancel checks
+CANCEL_CHECK_EVERY = 10000
+
+
+class NegativeCycleError(ValueError):
+    """Raised when a search meets a negative-weight cycle; cycle lists its
+    node ids in order, with the first node repeated at the end"""
+
+    def __init__(self, cycle):
+        super().__init__("The graph has a negative cycle.")
+        self.cycle = cycle
+
+
+def spfa(csr, source, stats=None, worker=None):
+    """Queue-based Bellman-Ford from source.
+
+    Returns (dist, pred) lists over all node ids (inf and -1 for nodes
+    source cannot reach, pred -1 for the source). stats gets the number of
+    relaxations. Raises NegativeCycleError if a negative cycle is reachable
+    from source; returns (None, None) if worker is cancelled.
+    """
+    n = csr.num_nodes
+    dist = [inf] * n
+    dist[source] = 0.0
+    return _label_correcting(csr, dist, [-1] * n, [source], stats, worker)
+
+
+def bellman_ford_path(csr, source, target, stats=None, worker=None):
+    """Single-pair SPFA; returns (cost, path) or (None, None) if unreachable or cancelled"""
+    dist, pred = spfa(csr, source, stats, worker)
+    if dist is None or dist[target] == inf:
+        return None, None
+    return dist[target], trace_path(pred, target)
+
+
+class JohnsonIndex:
+    """Johnson's reweighting, for many queries on a graph with negative weights.
+
+    One SPFA pass from a virtual source tied to every node by a zero edge
+    gives potentials h with w + h[u] - h[v] >= 0 on every edge. Every
+    s -> t path shifts by the same h[s] - h[t], so shortest paths stay
+    shortest and each query is a bidirectional Dijkstra on the reweighted
+    CSRs. version is the graph version the potentials were computed for.
+    """
+
+    def __init__(self, potentials, csr, reverse, version):
+        self.potentials = potentials
+        self.csr = csr
+        self.reverse = reverse
+        self.version = version
+
+    @classmethod
+    def build(cls, graph, stats=None, worker=None):
+        """Compute the potentials and reweighted CSRs; None if cancelled.
+
+        Raises NegativeCycleError if the graph has a negative cycle anywhere.
+        """
+        version = graph.version
+        csr, reverse = graph.csr(), graph.reverse_csr()
+        n = csr.num_nodes
+        dist, _ = _label_correcting(csr, [0.0] * n, [-1] * n, range(n), stats, worker)
+        if dist is None:
+            return None
+        h = np.array(dist)
+        return cls(h, reweight(csr, h, forward=True), reweight(reverse, h, forward=False), version)
+
+    def query(self, source, target, stats=None):
+        """(cost, path) on the original weights, or (None, None) if unreachable"""
+        cost, path = bidirectional_dijkstra(self.csr, self.reverse, source, target, stats)
+        if path is None:
+            return None, None
+        return cost - self.potentials[source] + self.potentials[target], path
+
+
+def reweight(csr, h, forward):
+    """CSR with weights w + h[tail] - h[head]; forward tells whether csr rows
+    are edge tails (forward CSR) or heads (reverse CSR). Round-off below
+    zero is clipped so Dijkstra only ever sees non-negative weights."""
+    rows = np.repeat(np.arange(csr.num_nodes), np.diff(csr.offsets))
+    tails, heads = (rows, csr.targets) if forward else (csr.targets, rows)
+    weights = np.maximum(csr.weights + h[tails] - h[heads], 0.0)
+    return CSR(csr.offsets, csr.targets, weights, csr.edge_ids)
+
+
+def _label_correcting(csr, dist, pred, sources, stats, worker):
+    """SPFA from every node of sources with their labels preset in dist"""
+    n = len(dist)
+    offsets = csr.offsets.tolist()
+    targets, weights = csr.targets, csr.weights
+    queue = deque(sources)
+    queued = bytearray(n)
+    for node in queue:
+        queued[node] = 1
+    relaxations = 0
+    next_cycle_check = n
+    next_cancel_check = CANCEL_CHECK_EVERY
+    while queue:
+        u = queue.popleft()
+        queued[u] = 0
+        du = dist[u]
+        lo, hi = offsets[u], offsets[u + 1]
+        for v, w in zip(targets[lo:hi].tolist(), weights[lo:hi].tolist()):
+            nd = du + w
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                relaxations += 1
+                if not queued[v]:
+                    queued[v] = 1
+                    queue.append(v)
+        if relaxations >= next_cycle_check:
+            next_cycle_check = relaxations + n
+            cycle = _predecessor_cycle(pred)
+            if cycle is not None:
+                raise NegativeCycleError(cycle)
+        if relaxations >= next_cancel_check:
+            next_cancel_check = relaxations + CANCEL_CHECK_EVERY
+            if worker is not None and worker.cancelled:
+                return None, None
+    if stats is not None:
+        stats['relaxations'] = relaxations
+    return dist, pred
+
+
+def _predecessor_cycle(pred):
+    """A cycle of the predecessor graph in edge order, or None; O(n)"""
+    walk = [-1] * len(pred)  # Start node of the walk that first reached each node
+    for start in range(len(pred)):
+        node = start
+        while node != -1 and walk[node] == -1:
+            walk[node] = start
+            node = pred[node]
+        if node != -1 and walk[node] == start:
+            # The walk came back to a node of its own: node is on a cycle
+            cycle = [node]
+            current = pred[node]
+            while current != node:
+                cycle.append(current)
+                current = pred[current]
+            cycle.append(node)
+            cycle.reverse()  # pred points backwards along the edges
+            return cycle
+    return None
@@ -0,0 +1,231 @@
+"""Shortest-path benchmark suite over seeded synthetic graphs.
+
+    python -m probleme1.benchmark --output bench.json [--kinds road grid]
+        [--sizes 100 10000] [--engines dijkstra mip] [--queries 20] [--seed 0]
+        [--negative]
+
+For every graph kind and size (in edges) it times generation, CSV load and
+binary load, then each engine: index preprocessing where there is one and,
+summed over the same random queries, every solve phase the solver reports
+(model build, optimize, search, path extraction). Each case runs in a fresh
+process, and each engine in a fresh one of its own that loads the case's
+binary graph file, so every peak RSS (case and engine) is its own; on
+Windows it is the peak working set, or null without psutil. Results go to
+JSON, one record per case, so runs from different commits can be diffed
+or plotted.
+
+With --negative every graph gets seeded negative weights without negative
+cycles (generators.with_negative_weights), the engines that need
+non-negative weights are skipped and SPFA is the reference. "auto" runs
+ShortestPathSolver's own selection; its record counts the engines it
+picked, so the selection can be checked against the per-engine numbers.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+import numpy as np
+from .generators import GENERATORS, with_negative_weights
+from .graph_io import load_csv, load_binary, save_binary
+from .path_solver import ENGINES, ShortestPathSolver
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_ENGINES = ("dijkstra", "bidirectional", "alt", "ch", "spfa", "johnson", "network", "lp", "mip", "auto")
+DEFAULT_QUERIES = 20
+# Largest graph (in edges) each engine runs on unless --no-limits is given:
+# past these, pure-Python preprocessing or the Gurobi model build takes
+# minutes per case
+ENGINE_MAX_EDGES = {"ch": 100_000, "spfa": 100_000, "network": 100_000, "mip": 100_000, "lp": 100_000}
+# Objectives further apart than this count as a mismatch against the
+# reference engine: Dijkstra, or SPFA with negative weights
+TOLERANCE = 1e-6
+
+
+def run_case(kind, size, engines=DEFAULT_ENGINES, queries=DEFAULT_QUERIES, seed=0, limits=True,
+             negative=False):
+    """Benchmark one generated graph; returns a JSON-ready dict"""
+    case = {'kind': kind, 'size': size, 'seed': seed, 'negative': negative, 'engines': {}}
+    started = time.perf_counter()
+    graph = GENERATORS[kind](size, seed=seed)
+    if negative:
+        graph = with_negative_weights(graph, seed=seed)
+    case['generate_s'] = time.perf_counter() - started
+    case['nodes'] = graph.number_of_nodes()
+    case['edges'] = graph.number_of_edges()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "graph.csv")
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerows([name] for name in graph.names)
+            writer.writerows(graph.edges())
+        started = time.perf_counter()
+        load_csv(path)
+        case['csv_load_s'] = time.perf_counter() - started
+        binary = path + ".npgraph"
+        save_binary(graph, binary)
+        started = time.perf_counter()
+        load_binary(binary)
+        case['binary_load_s'] = time.perf_counter() - started
+        case['peak_rss_mb'] = _peak_rss_mb()
+
+        pairs = np.random.default_rng(seed).integers(len(graph.names), size=(queries, 2)).tolist()
+        reference_engine = "spfa" if negative else "dijkstra"
+        reference = None  # Its objectives, to cross-check every other engine
+        for engine in sorted(engines, key=lambda engine: engine != reference_engine):
+            if negative and engine != "auto" and not ENGINES[engine].negative_weights:
+                case['engines'][engine] = {'skipped': "needs non-negative weights"}
+                continue
+            if limits and case['edges'] > ENGINE_MAX_EDGES.get(engine, float('inf')):
+                case['engines'][engine] = {'skipped': f"more than {ENGINE_MAX_EDGES[engine]} edges"}
+                continue
+            # A fresh process per engine, so its peak RSS is the loaded graph
+            # plus this engine's own indexes and models, not the earlier ones'
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                record = pool.submit(_run_engine, binary, engine, pairs).result()
+            case['engines'][engine] = record
+            if 'error' in record:
+                continue
+            if engine == reference_engine:
+                reference = record['objectives']
+            elif reference is not None:
+                record['mismatches'] = sum(
+                    (a is None) != (b is None) or (a is not None and abs(a - b) > TOLERANCE)
+                    for a, b in zip(record['objectives'], reference))
+            del record['objectives']
+            print(f"  {kind} {size} {engine}: {record['query_mean_s'] * 1000:.2f} ms/query", file=sys.stderr)
+    return case
+
+
+def _run_engine(path, engine, pairs):
+    """Load the graph file, then time the index build and the queries of one
+    engine; runs in its own process. The record keeps the raw objectives for
+    the caller's cross-check, or is {'error': ...} if the engine failed"""
+    graph, _ = load_binary(path)
+    names = graph.names
+    solver = ShortestPathSolver(graph, engine)
+    record = {}
+    try:
+        started = time.perf_counter()
+        if engine == "alt":
+            solver.ensure_landmarks()
+        elif engine == "ch":
+            solver.ensure_hierarchy()
+            record['shortcuts'] = solver.hierarchy.num_shortcuts
+        elif engine == "johnson":
+            solver.ensure_johnson()
+        if engine in ("alt", "ch", "johnson"):
+            record['index_build_s'] = time.perf_counter() - started
+        record.update(_time_queries(solver, names, pairs))
+    except Exception as e:
+        # e.g. a size-limited Gurobi license: note it and go on
+        return {'error': f"{type(e).__name__}: {e}"}
+    finally:
+        solver.invalidate_model()
+    record['peak_rss_mb'] = _peak_rss_mb()
+    return record
+
+
+def _time_queries(solver, names, pairs):
+    """Timed queries: phase sums, mean and max time, unreachable count and objectives"""
+    record = {}
+    phases = {}
+    totals = []
+    settled = 0
+    objectives = []
+    selected = {}
+    for source, target in pairs:
+        result = solver.find_path(names[source], names[target])
+        selected[result.stats['engine']] = selected.get(result.stats['engine'], 0) + 1
+        for phase, seconds in result.timings.items():
+            phases[phase] = phases.get(phase, 0.0) + seconds
+        totals.append(result.timings['total'])
+        settled += result.stats.get('settled', 0)
+        objectives.append(result.objective)
+    record['phases_s'] = phases
+    record['query_mean_s'] = float(np.mean(totals))
+    record['query_max_s'] = float(np.max(totals))
+    record['unreachable'] = sum(objective is None for objective in objectives)
+    if settled:
+        record['settled_mean'] = settled / len(pairs)
+    if solver.engine == "auto":
+        record['selected'] = selected
+    record['objectives'] = objectives
+    return record
+
+
+def run_suite(kinds=tuple(GENERATORS), sizes=DEFAULT_SIZES, engines=DEFAULT_ENGINES,
+              queries=DEFAULT_QUERIES, seed=0, limits=True, negative=False):
+    """Run every (kind, size) case in its own process; returns the report dict"""
+    report = {'meta': _meta(queries, seed), 'cases': []}
+    for kind in kinds:
+        for size in sizes:
+            print(f"{kind} {size}", file=sys.stderr)
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as pool:
+                report['cases'].append(pool.submit(run_case, kind, size, engines, queries, seed, limits,
+                                                       negative).result())
+    return report
+
+
+def _peak_rss_mb():
+    """Peak resident memory of this process in MiB, or None where it cannot be read"""
+    if sys.platform == "win32":
+        # No resource module on Windows: the peak working set, if psutil is there
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / (1 << 20)
+    import resource
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def _meta(queries, seed):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    try:
+        import gurobipy
+        gurobi = ".".join(map(str, gurobipy.gurobi.version()))
+    except Exception:
+        gurobi = None
+    return {'commit': commit, 'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            'python': platform.python_version(), 'numpy': np.__version__, 'gurobi': gurobi,
+            'machine': platform.machine(), 'cpus': os.cpu_count(), 'queries': queries, 'seed': seed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the shortest-path engines on synthetic graphs.")
+    parser.add_argument("--kinds", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), help="edge counts")
+    parser.add_argument("--engines", nargs="+", default=list(DEFAULT_ENGINES))
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES, help="random queries per engine")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-limits", action="store_true", help="run every engine at every size")
+    parser.add_argument("--negative", action="store_true",
+                        help="add negative weights (no negative cycles); SPFA is the reference")
+    parser.add_argument("--output", default="-", help="JSON file to write (default: stdout)")
+    args = parser.parse_args(argv)
+    report = run_suite(args.kinds, args.sizes, args.engines, args.queries, args.seed, not args.no_limits,
+                       args.negative)
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
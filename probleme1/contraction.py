@@ -0,0 +1,261 @@
+import heapq
+from math import inf
+import numpy as np
+from .graph_core import ID_DTYPE, build_csr
+
+# Witness searches only have to be good enough: giving up early just adds a
+# shortcut that was not strictly needed, never a wrong answer.
+WITNESS_SETTLE_LIMIT = 50
+# How often (in contracted nodes) the build checks for cancellation
+CANCEL_CHECK_EVERY = 1000
+
+
+class ContractionHierarchy:
+    """Contraction-hierarchy index for fast point-to-point queries.
+
+    Nodes are contracted one by one in rank order, adding a shortcut
+    u -> w (via the contracted node, its "middle") wherever the only
+    shortest u -> w path ran through it. Every edge of the result, original
+    or shortcut, joins a lower-ranked and a higher-ranked node, so a query
+    is two small Dijkstra searches that only ever go up in rank.
+    Shortcuts are unpacked back into original edges through their middles.
+    """
+
+    def __init__(self, rank, src, dst, weight, middle, content_hash=None, version=None, id_hash=None):
+        self.rank = rank
+        self.src, self.dst, self.weight, self.middle = src, dst, weight, middle
+        self.content_hash = content_hash  # Graph.content_hash() of the graph it was built for
+        self.id_hash = id_hash            # ... and its Graph.id_hash(), since everything is by node id
+        self.version = version            # graph.version it is valid for in this session
+        n = len(rank)
+        up = rank[dst] > rank[src]
+        self.up = build_csr(n, src[up], dst[up], weight[up])          # u -> higher-ranked v
+        self.down = build_csr(n, dst[~up], src[~up], weight[~up])     # v <- higher-ranked u
+        shortcut = np.flatnonzero(middle >= 0)
+        self.middles = dict(zip(zip(src[shortcut].tolist(), dst[shortcut].tolist()),
+                                middle[shortcut].tolist()))
+        self._lists = None
+
+    @property
+    def num_shortcuts(self):
+        return len(self.middles)
+
+    # -- building ----------------------------------------------------------
+
+    @classmethod
+    def build(cls, graph, worker=None):
+        """Contract every node of graph, cheapest first; None if the worker is cancelled.
+
+        The order is the usual lazy one: a node's priority is its edge
+        difference (shortcuts added minus edges removed) plus the number of
+        already contracted neighbours, recomputed when it reaches the top of
+        the queue. Weights must be non-negative.
+        """
+        version, content_hash, id_hash = graph.version, graph.content_hash(), graph.id_hash()
+        n = graph.number_of_nodes()
+        out = [{} for _ in range(n)]
+        inn = [{} for _ in range(n)]
+        for u, v, w in zip(*(array.tolist() for array in graph.edge_arrays())):
+            if u != v:
+                out[u][v] = w
+                inn[v][u] = w
+        middle = {}
+        deleted = [0] * n
+        edges = []  # (u, v, weight, middle) of the finished hierarchy
+        rank = np.empty(n, dtype=ID_DTYPE)
+
+        def simulate(v):
+            shortcuts = _shortcuts(out, inn, v)
+            return len(shortcuts) - len(out[v]) - len(inn[v]) + deleted[v], shortcuts
+
+        def cancelled(count):
+            return worker is not None and count % CANCEL_CHECK_EVERY == 0 and worker.cancelled
+
+        queue = []
+        for v in range(n):
+            if cancelled(v):
+                return None
+            queue.append((simulate(v)[0], v))
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            _, v = heapq.heappop(queue)
+            priority, shortcuts = simulate(v)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, v))
+                continue
+            if cancelled(order):
+                return None
+
+            # Edges of v are final now: v is the lower-ranked end of all of them
+            for w, weight in out[v].items():
+                edges.append((v, w, weight, middle.get((v, w), -1)))
+                del inn[w][v]
+                deleted[w] += 1
+            for u, weight in inn[v].items():
+                edges.append((u, v, weight, middle.get((u, v), -1)))
+                del out[u][v]
+                deleted[u] += 1
+            out[v] = inn[v] = None
+            for u, w, weight in shortcuts:
+                if weight < out[u].get(w, inf):
+                    out[u][w] = inn[w][u] = weight
+                    middle[(u, w)] = v
+            rank[v] = order
+            order += 1
+
+        columns = list(zip(*edges)) or [(), (), (), ()]
+        return cls(rank,
+                   np.array(columns[0], dtype=ID_DTYPE), np.array(columns[1], dtype=ID_DTYPE),
+                   np.array(columns[2], dtype=np.float64), np.array(columns[3], dtype=ID_DTYPE),
+                   content_hash, version, id_hash)
+
+    # -- queries -----------------------------------------------------------
+
+    def query(self, source, target, stats=None):
+        """Shortest source -> target path as original node ids.
+
+        Returns (cost, path) or (None, None); stats gets the settled count
+        of both upward searches.
+        """
+        if source == target:
+            if stats is not None:
+                stats['settled'] = 1
+            return 0.0, [source]
+
+        # Index 0 searches up from source, 1 searches up (backwards) from target
+        dists = [{source: 0.0}, {target: 0.0}]
+        preds = [{source: -1}, {target: -1}]
+        settled = [set(), set()]
+        heaps = [[(0.0, source)], [(0.0, target)]]
+        adjacency = self.adjacency()
+        best, meet = inf, None
+
+        while True:
+            # Advance the side with the smaller key; stop once neither can beat best
+            forward = heaps[0][0][0] if heaps[0] else inf
+            backward = heaps[1][0][0] if heaps[1] else inf
+            if min(forward, backward) >= best:
+                break
+            side = 0 if forward <= backward else 1
+            d, u = heapq.heappop(heaps[side])
+            if u in settled[side]:
+                continue
+            settled[side].add(u)
+            dist, other = dists[side], dists[1 - side]
+            if u in other and d + other[u] < best:
+                best, meet = d + other[u], u
+
+            # Stall on demand: if a higher node already reaches u more cheaply
+            # (over an edge the search cannot use), nothing above u is
+            # reached optimally through it
+            offsets, targets, weights = adjacency[1 - side]
+            lo, hi = offsets[u], offsets[u + 1]
+            stalled = False
+            for x, w in zip(targets[lo:hi], weights[lo:hi]):
+                if x in dist and dist[x] + w < d:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+
+            offsets, targets, weights = adjacency[side]
+            lo, hi = offsets[u], offsets[u + 1]
+            for v, w in zip(targets[lo:hi], weights[lo:hi]):
+                nd = d + w
+                if nd < dist.get(v, inf):
+                    dist[v] = nd
+                    preds[side][v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+
+        if stats is not None:
+            stats['settled'] = len(settled[0]) + len(settled[1])
+        if meet is None:
+            return None, None
+
+        path = []
+        node = meet
+        while node != -1:
+            path.append(node)
+            node = preds[0][node]
+        path.reverse()
+        node = preds[1][meet]
+        while node != -1:
+            path.append(node)
+            node = preds[1][node]
+        return best, self.unpack(path)
+
+    def adjacency(self):
+        """Upward and downward CSR as Python lists, built on the first query.
+
+        Queries touch few nodes each, so slicing lists beats converting a
+        NumPy row per settled node.
+        """
+        if self._lists is None:
+            self._lists = [(csr.offsets.tolist(), csr.targets.tolist(), csr.weights.tolist())
+                           for csr in (self.up, self.down)]
+        return self._lists
+
+    def unpack(self, path):
+        """Replace every shortcut along a hierarchy path by the edges it stands for"""
+        result = [path[0]]
+        for u, w in zip(path, path[1:]):
+            stack = [(u, w)]
+            while stack:
+                a, b = stack.pop()
+                via = self.middles.get((a, b))
+                if via is None:
+                    result.append(b)
+                else:
+                    # Expand the second half last so edges come out in order
+                    stack.append((via, b))
+                    stack.append((a, via))
+        return result
+
+    # -- persistence -------------------------------------------------------
+
+    def save(self, path):
+        """Write the hierarchy to an .npz file (plain, so loading needs no parsing)"""
+        np.savez(path, rank=self.rank, src=self.src, dst=self.dst, weight=self.weight,
+                 middle=self.middle, content_hash=np.array(self.content_hash or ""),
+                 id_hash=np.array(self.id_hash or ""))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['rank'], data['src'], data['dst'], data['weight'], data['middle'],
+                       str(data['content_hash']) or None, id_hash=str(data['id_hash']) or None)
+
+
+def _shortcuts(out, inn, v):
+    """Shortcuts (u, w, weight) that contracting v would need right now"""
+    shortcuts = []
+    for u, to_v in inn[v].items():
+        targets = [(w, to_v + from_v) for w, from_v in out[v].items() if w != u]
+        if not targets:
+            continue
+        dist = _witness_search(out, u, v, max(weight for _, weight in targets))
+        shortcuts.extend((u, w, weight) for w, weight in targets if dist.get(w, inf) > weight)
+    return shortcuts
+
+
+def _witness_search(out, source, skip, limit):
+    """Bounded Dijkstra from source avoiding skip; tentative distances are real paths too"""
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    while heap:
+        d, x = heapq.heappop(heap)
+        if d > dist[x]:
+            continue
+        if d > limit or settled >= WITNESS_SETTLE_LIMIT:
+            break
+        settled += 1
+        for y, w in out[x].items():
+            if y == skip:
+                continue
+            nd = d + w
+            if nd < dist.get(y, inf):
+                dist[y] = nd
+                heapq.heappush(heap, (nd, y))
+    return dist
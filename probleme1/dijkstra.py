@@ -0,0 +1,141 @@
+import heapq
+from math import inf
+
+# Searches run over CSR arrays with integer node ids (see graph_core.CSR);
+# labels are dicts so a point-to-point query only pays for the nodes it reaches.
+
+
+def dijkstra(csr, source, target=None, stats=None):
+    """Heap-based Dijkstra from source, stopping early once target is settled.
+
+    Returns the (dist, pred) label dicts; pred maps each reached node to its
+    parent on the shortest-path tree (-1 for the source). If stats is a
+    dict, the number of settled nodes is stored under 'settled'.
+    """
+    dist = {source: 0.0}
+    pred = {source: -1}
+    settled = set()
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+        if u == target:
+            break
+        for v, w in csr.neighbors(u):
+            nd = d + w
+            if nd < dist.get(v, inf):
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+    if stats is not None:
+        stats['settled'] = len(settled)
+    return dist, pred
+
+
+def trace_path(pred, target):
+    """Walk a predecessor map back from target and return the path in order"""
+    path = []
+    node = target
+    while node != -1:
+        path.append(node)
+        node = pred[node]
+    path.reverse()
+    return path
+
+
+def shortest_path(csr, source, target, stats=None):
+    """Single-pair Dijkstra; returns (cost, path) or (None, None) if unreachable"""
+    dist, pred = dijkstra(csr, source, target, stats)
+    if target not in dist:
+        return None, None
+    return dist[target], trace_path(pred, target)
+
+
+def bidirectional_dijkstra(csr, reverse, source, target, stats=None):
+    """Bidirectional Dijkstra over the forward and reverse CSR.
+
+    Returns (cost, path) or (None, None) if target is unreachable; stats
+    gets the settled count of both searches combined.
+    """
+    if source == target:
+        if stats is not None:
+            stats['settled'] = 1
+        return 0.0, [source]
+
+    # Index 0 is the forward search from source, 1 the backward search from target
+    dists = [{source: 0.0}, {target: 0.0}]
+    preds = [{source: -1}, {target: -1}]
+    settled = [set(), set()]
+    heaps = [[(0.0, source)], [(0.0, target)]]
+    adjacency = [csr, reverse]
+    best, meet = inf, None
+
+    while heaps[0] and heaps[1]:
+        # No undiscovered path can beat best once both frontiers pass it
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, u = heapq.heappop(heaps[side])
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
+
+        dist, other = dists[side], dists[1 - side]
+        for v, w in adjacency[side].neighbors(u):
+            nd = d + w
+            if nd < dist.get(v, inf):
+                dist[v] = nd
+                preds[side][v] = u
+                heapq.heappush(heaps[side], (nd, v))
+            if v in other and dist[v] + other[v] < best:
+                best = dist[v] + other[v]
+                meet = v
+
+    if stats is not None:
+        stats['settled'] = len(settled[0]) + len(settled[1])
+    if meet is None:
+        return None, None
+
+    path = trace_path(preds[0], meet)
+    node = preds[1][meet]
+    while node != -1:
+        path.append(node)
+        node = preds[1][node]
+    return best, path
+
+
+def astar(csr, source, target, heuristic, stats=None):
+    """A* search guided by heuristic(nodes), consistent lower bounds on the
+    distance from each listed node to target (e.g. LandmarkIndex.heuristic).
+
+    Bounds are asked for per expanded node, for all neighbours it improves
+    at once. Nodes with an infinite bound cannot reach target and are never
+    queued. Returns (cost, path) or (None, None); stats gets the settled count.
+    """
+    dist = {source: 0.0}
+    pred = {source: -1}
+    settled = set()
+    heap = [(heuristic([source])[0], 0.0, source)]
+    while heap:
+        _, d, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+        if u == target:
+            break
+        improved = [(v, d + w) for v, w in csr.neighbors(u) if d + w < dist.get(v, inf)]
+        if not improved:
+            continue
+        for (v, nd), bound in zip(improved, heuristic([v for v, _ in improved])):
+            if bound == inf or nd >= dist.get(v, inf):  # Parallel edges can repeat v
+                continue
+            dist[v] = nd
+            pred[v] = u
+            heapq.heappush(heap, (nd + bound, nd, v))
+    if stats is not None:
+        stats['settled'] = len(settled)
+    if target not in settled:
+        return None, None
+    return dist[target], trace_path(pred, target)
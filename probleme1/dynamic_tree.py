@@ -0,0 +1,179 @@
+import heapq
+from math import inf
+import numpy as np
+from .dijkstra import trace_path
+from .graph_core import CSR, NODE_ADDED, EDGE_REMOVED
+
+# Shortest-path tree from one source kept up to date under single-edge edits,
+# in the style of Ramalingam and Reps. Edits are noted as they arrive and
+# repaired on the next query: a tree edge that got dearer or was removed
+# resets the subtree hanging from its head, whose nodes are re-seeded from
+# their in-edges out of the rest of the tree; an edge that got cheaper or was
+# added seeds its head if it now beats the head's label. One Dijkstra from
+# those seeds settles only the nodes whose distance can change, so a repair
+# costs in proportion to the change, not the graph. Needs non-negative weights.
+#
+# Neighbours come from CSR snapshots taken when the tree was built: weights
+# are patched in place (inf for a removed edge) and added edges live in small
+# per-node overlays, so an edit never forces a CSR rebuild.
+
+
+class DynamicTree:
+    """Shortest-path tree from source over a Graph, repaired after edits.
+
+    The owner forwards every graph event except CLEARED to on_graph_event()
+    (a CLEARED graph needs a new tree); repair() then brings dist and pred,
+    lists over node ids with inf and -1 where unreached, up to date.
+    """
+
+    def __init__(self, graph, source, stats=None):
+        self.graph = graph
+        self.source = source
+        csr, reverse = graph.csr(), graph.reverse_csr()
+        # Own copies of the weights, since edits patch them
+        self.csr = CSR(csr.offsets, csr.targets, csr.weights.copy(), csr.edge_ids)
+        self.reverse = CSR(reverse.offsets, reverse.targets, reverse.weights.copy(), reverse.edge_ids)
+        self.added = {}     # u -> {v: weight} for edges added since the snapshot
+        self.added_in = {}  # v -> {u: weight}, the same edges by head
+        n = csr.num_nodes
+        self.dist = [inf] * n
+        self.pred = [-1] * n
+        self.children = {}  # Tree children of each node that has some
+        self._cut = set()   # Heads of tree edges made dearer or removed since the last repair
+        self._edges = []    # (u, v) edges made cheaper or added since the last repair
+        self.dist[source] = 0.0
+        self._settle([(0.0, source)], stats)
+
+    def on_graph_event(self, event, index):
+        """Patch the snapshot for one edit and note what the next repair must look at"""
+        if event == NODE_ADDED:
+            self.dist.append(inf)
+            self.pred.append(-1)
+            return
+        if event == EDGE_REMOVED:
+            _, u, v = index
+            weight = inf
+        else:
+            src, dst, weights = self.graph.edge_arrays()
+            u, v, weight = int(src[index]), int(dst[index]), float(weights[index])
+        old = self._set_weight(u, v, weight)
+        if weight > old:
+            if self.pred[v] == u:
+                self._cut.add(v)
+        elif weight < old:
+            self._edges.append((u, v))
+
+    def repair(self, stats=None):
+        """Bring the tree up to date with the edits seen since the last repair.
+
+        stats gets the number of nodes reset and settled.
+        """
+        dist, pred = self.dist, self.pred
+        reset = []
+        for root in self._cut:
+            if pred[root] == -1:
+                continue  # Already reset with the subtree of an earlier root
+            self.children[pred[root]].discard(root)
+            nodes = [root]
+            for node in nodes:
+                nodes.extend(self.children.pop(node, ()))
+            for node in nodes:
+                dist[node] = inf
+                pred[node] = -1
+            reset.extend(nodes)
+
+        heap = []
+        for v in reset:
+            for u, w in self._in(v):
+                if dist[u] + w < dist[v]:
+                    self._attach(v, u, dist[u] + w)
+            if dist[v] < inf:
+                heap.append((dist[v], v))
+        for u, v in self._edges:
+            d = dist[u] + self.weight(u, v)
+            if d < dist[v]:
+                self._attach(v, u, d)
+                heap.append((d, v))
+        self._cut = set()
+        self._edges = []
+        self._settle(heap, stats)
+        if stats is not None:
+            stats['reset'] = len(reset)
+
+    def path(self, target):
+        """(cost, path) from source to target, or (None, None) if unreachable"""
+        if self.dist[target] == inf:
+            return None, None
+        return self.dist[target], trace_path(self.pred, target)
+
+    def weight(self, u, v):
+        """Current weight of u -> v, inf if there is no such edge"""
+        positions = self._positions(u, v)
+        if positions is not None:
+            return float(self.csr.weights[positions[0]])
+        return self.added.get(u, {}).get(v, inf)
+
+    def _settle(self, heap, stats):
+        """Dijkstra from the labelled nodes on heap, reusing every other label"""
+        dist = self.dist
+        heapq.heapify(heap)
+        settled = set()
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u] or u in settled:
+                continue
+            settled.add(u)
+            for v, w in self._out(u):
+                nd = d + w
+                if nd < dist[v]:
+                    self._attach(v, u, nd)
+                    heapq.heappush(heap, (nd, v))
+        if stats is not None:
+            stats['settled'] = len(settled)
+
+    def _attach(self, v, u, d):
+        """Hang v under u at distance d"""
+        parent = self.pred[v]
+        if parent != -1:
+            self.children[parent].discard(v)
+        self.pred[v] = u
+        self.children.setdefault(u, set()).add(v)
+        self.dist[v] = d
+
+    def _out(self, u):
+        if u < self.csr.num_nodes:
+            yield from self.csr.neighbors(u)
+        yield from self.added.get(u, {}).items()
+
+    def _in(self, v):
+        if v < self.reverse.num_nodes:
+            yield from self.reverse.neighbors(v)
+        yield from self.added_in.get(v, {}).items()
+
+    def _positions(self, u, v):
+        """Positions of u -> v in the forward and reverse snapshots, or None"""
+        if u >= self.csr.num_nodes or v >= self.csr.num_nodes:
+            return None
+        positions = []
+        for csr, row, col in ((self.csr, u, v), (self.reverse, v, u)):
+            lo, hi = csr.row(row)
+            hit = np.flatnonzero(csr.targets[lo:hi] == col)
+            if not hit.size:
+                return None
+            positions.append(lo + int(hit[0]))
+        return positions
+
+    def _set_weight(self, u, v, weight):
+        """Give u -> v a new weight (inf removes it); returns the old one, inf if it had none"""
+        positions = self._positions(u, v)
+        if positions is not None:
+            old = float(self.csr.weights[positions[0]])
+            self.csr.weights[positions[0]] = weight
+            self.reverse.weights[positions[1]] = weight
+            return old
+        old = self.added.get(u, {}).pop(v, inf)
+        self.added_in.get(v, {}).pop(u, None)
+        if weight < inf:
+            self.added.setdefault(u, {})[v] = weight
+            self.added_in.setdefault(v, {})[u] = weight
+        return old
@@ -0,0 +1,118 @@
+import numpy as np
+from .graph_core import Graph, ID_DTYPE
+
+# Seeded synthetic graphs for benchmarks. Each generator aims at roughly
+# `edges` directed edges (duplicates and self-loops are dropped, so a few
+# fewer) and returns a Graph with nodes named N0, N1, ... Weights are
+# positive with two decimals, like the hand-made test graphs;
+# with_negative_weights() turns any of them into a graph with negative
+# weights but no negative cycle.
+
+
+def random_graph(edges, seed=0, degree=5):
+    """Uniform random digraph with average out-degree `degree`"""
+    rng = np.random.default_rng(seed)
+    n = max(2, edges // degree)
+    src = rng.integers(n, size=edges)
+    dst = rng.integers(n, size=edges)
+    return _graph(n, src, dst, rng.uniform(1, 100, edges))
+
+
+def grid_graph(edges, seed=0):
+    """Square 4-neighbour grid with both directions of every link"""
+    rng = np.random.default_rng(seed)
+    side = max(2, int(round(np.sqrt(edges / 4))))
+    src, dst = _grid_links(side)
+    return _graph(side * side, src, dst, rng.uniform(1, 100, len(src)))
+
+
+def scale_free_graph(edges, seed=0, links_per_node=3):
+    """Barabasi-Albert preferential attachment; links go both ways"""
+    rng = np.random.default_rng(seed)
+    k = links_per_node
+    n = max(k + 1, edges // (2 * k))
+    # Every link endpoint is appended to pool, so sampling a uniform pool
+    # entry picks an existing node with probability proportional to degree
+    pool = np.empty(2 * k * n, dtype=np.int64)
+    pool[:k] = np.arange(k)
+    size = k
+    picks = rng.random((n, k))
+    src, dst = [], []
+    for node in range(k, n):
+        targets = pool[(picks[node] * size).astype(np.int64)]
+        src.extend([node] * k)
+        dst.extend(targets.tolist())
+        pool[size:size + k] = targets
+        pool[size + k:size + 2 * k] = node
+        size += 2 * k
+    src, dst = np.array(src), np.array(dst)
+    src, dst = np.concatenate((src, dst)), np.concatenate((dst, src))
+    return _graph(n, src, dst, rng.uniform(1, 100, len(src)))
+
+
+def road_graph(edges, seed=0, drop=0.1, highway_every=8, highway_factor=0.3):
+    """Road-network stand-in: a jittered grid with some streets missing.
+
+    Weights are Euclidean lengths, divided by road speed: every
+    highway_every-th row and column is a fast road, which gives the graph
+    the hierarchy real road networks have.
+    """
+    rng = np.random.default_rng(seed)
+    side = max(2, int(round(np.sqrt(edges / (4 * (1 - drop))))))
+    xy = np.stack(np.meshgrid(np.arange(side), np.arange(side)), axis=-1).reshape(-1, 2).astype(float)
+    xy += rng.uniform(-0.3, 0.3, xy.shape)
+    src, dst = _grid_links(side)
+    # Drop streets per link, so both directions go together
+    keep = rng.random(len(src) // 2) >= drop
+    keep = np.concatenate((keep, keep))
+    src, dst = src[keep], dst[keep]
+
+    length = np.hypot(*(xy[src] - xy[dst]).T)
+    row, column = src // side, src % side
+    horizontal = (dst - src) % side != 0
+    highway = np.where(horizontal, row % highway_every == 0, column % highway_every == 0)
+    weight = length * np.where(highway, highway_factor, 1.0) * 10
+    return _graph(side * side, src, dst, weight)
+
+
+def with_negative_weights(graph, seed=0, spread=1.0):
+    """Copy of graph with weight w(u, v) + pot[u] - pot[v] for seeded random
+    node potentials up to spread times the mean weight.
+
+    Every cycle keeps its weight, so a graph with positive weights gets
+    negative ones but no negative cycle, and the same shortest paths.
+    """
+    rng = np.random.default_rng(seed)
+    src, dst, weight = graph.edge_arrays()
+    pot = np.round(rng.uniform(0, spread * weight.mean(), graph.number_of_nodes()), 2)
+    reweighted = Graph()
+    reweighted.add_nodes(graph.names)
+    reweighted.add_edges(src.copy(), dst.copy(), np.round(weight + pot[src] - pot[dst], 2))
+    return reweighted
+
+
+GENERATORS = {
+    "random": random_graph,
+    "grid": grid_graph,
+    "scale_free": scale_free_graph,
+    "road": road_graph,
+}
+
+
+def _grid_links(side):
+    """Every horizontal and vertical link of a side x side grid: all links one
+    way, then the same links reversed in the same order"""
+    ids = np.arange(side * side).reshape(side, side)
+    right = (ids[:, :-1].ravel(), ids[:, 1:].ravel())
+    down = (ids[:-1, :].ravel(), ids[1:, :].ravel())
+    src = np.concatenate((right[0], down[0], right[1], down[1]))
+    dst = np.concatenate((right[1], down[1], right[0], down[0]))
+    return src, dst
+
+
+def _graph(n, src, dst, weight):
+    keep = src != dst
+    graph = Graph()
+    graph.add_nodes([f"N{i}" for i in range(n)])
+    graph.add_edges(src[keep].astype(ID_DTYPE), dst[keep].astype(ID_DTYPE), np.round(weight[keep], 2))
+    return graph
@@ -0,0 +1,376 @@
+from contextlib import contextmanager
+import hashlib
+import numpy as np
+
+# Node ids and edge slots are int32: 2 billion of either is far beyond what
+# fits in memory anyway, and it halves the index arrays.
+ID_DTYPE = np.int32
+
+# Change events passed to Graph listeners as listener(event, index), where
+# index is the node id or edge slot concerned. CLEARED (index None) covers
+# every bulk change: listeners should resync from scratch.
+NODE_ADDED = 'node_added'
+EDGE_ADDED = 'edge_added'
+WEIGHT_CHANGED = 'weight_changed'
+# EDGE_REMOVED's index is (slot, u, v): the vacated slot, which now holds
+# the former last edge, and the node ids of the edge that was removed.
+EDGE_REMOVED = 'edge_removed'
+CLEARED = 'cleared'
+
+
+class CSR:
+    """Compressed sparse row adjacency: row u spans offsets[u]:offsets[u + 1].
+
+    edge_ids maps each CSR position back to the edge slot in the owning
+    Graph, so per-edge data (e.g. MIP variables) can be indexed by slot.
+    """
+    __slots__ = ('offsets', 'targets', 'weights', 'edge_ids')
+
+    def __init__(self, offsets, targets, weights, edge_ids):
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.edge_ids = edge_ids
+
+    @property
+    def num_nodes(self):
+        return len(self.offsets) - 1
+
+    def row(self, u):
+        return int(self.offsets[u]), int(self.offsets[u + 1])
+
+    def neighbors(self, u):
+        """Iterate (target, weight) pairs of row u as plain Python values"""
+        lo, hi = self.row(u)
+        return zip(self.targets[lo:hi].tolist(), self.weights[lo:hi].tolist())
+
+
+def build_csr(n, src, dst, weight):
+    """Group edges by src into a CSR over n nodes"""
+    order = np.argsort(src, kind='stable').astype(ID_DTYPE)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=offsets[1:])
+    return CSR(offsets, dst[order], weight[order], order)
+
+
+class Graph:
+    """Array-backed directed graph with interned integer node ids.
+
+    Node names are interned once into ids (names[id] / ids[name]); edges live
+    in growable src/dst/weight arrays indexed by edge slot. Forward and
+    reverse CSR views are built lazily and cached until the next mutation,
+    and version is bumped on every mutation so derived caches can tell when
+    they are stale. Views and caches can also subscribe() to per-item change
+    events. NetworkX is only materialised on demand via to_networkx.
+    """
+
+    def __init__(self):
+        self.names = []   # id -> name
+        self.ids = {}     # name -> id
+        self._src = np.empty(16, dtype=ID_DTYPE)
+        self._dst = np.empty(16, dtype=ID_DTYPE)
+        self._weight = np.empty(16)
+        self._m = 0
+        self._slots = None  # (u, v) -> edge slot, built on the first single-edge edit
+        self._csr = None
+        self._reverse = None
+        self.version = 0
+        self._hash = None  # (version, content_hash())
+        self._listeners = []
+        self._batch_depth = 0
+
+    # -- nodes -------------------------------------------------------------
+
+    @property
+    def nodes(self):
+        """Node names in id order (read-only view)"""
+        return self.names
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def __len__(self):
+        return len(self.names)
+
+    def number_of_nodes(self):
+        return len(self.names)
+
+    def add_node(self, name):
+        """Intern name and return its id; existing nodes are left untouched"""
+        node = self.ids.get(name)
+        if node is None:
+            node = len(self.names)
+            self.names.append(name)
+            self.ids[name] = node
+            self._touch()
+            self._emit(NODE_ADDED, node)
+        return node
+
+    def add_nodes(self, names):
+        """Intern many names at once; returns their ids as an array"""
+        return np.fromiter((self.add_node(name) for name in names), dtype=ID_DTYPE)
+
+    # -- edges -------------------------------------------------------------
+
+    def number_of_edges(self):
+        return self._m
+
+    def edge_arrays(self):
+        """(src, dst, weight) views over the live edge slots"""
+        m = self._m
+        return self._src[:m], self._dst[:m], self._weight[:m]
+
+    def edges(self):
+        """Iterate (u, v, weight) with node names, in slot order"""
+        names = self.names
+        src, dst, weight = self.edge_arrays()
+        for u, v, w in zip(src.tolist(), dst.tolist(), weight.tolist()):
+            yield names[u], names[v], w
+
+    def edge_slot(self, u, v):
+        """Slot of edge u -> v by node name, or None if there is no such edge"""
+        ui, vi = self.ids.get(u), self.ids.get(v)
+        if ui is None or vi is None:
+            return None
+        if self._slots is not None:
+            return self._slots.get((ui, vi))
+        # No slot map yet (e.g. right after a bulk load): scan u's CSR row
+        csr = self.csr()
+        lo, hi = csr.row(ui)
+        hits = np.flatnonzero(csr.targets[lo:hi] == vi)
+        return int(csr.edge_ids[lo + hits[-1]]) if len(hits) else None
+
+    def has_edge(self, u, v):
+        return self.edge_slot(u, v) is not None
+
+    def weight(self, u, v):
+        """Weight of edge u -> v by node name; KeyError if there is no such edge"""
+        slot = self.edge_slot(u, v)
+        if slot is None:
+            raise KeyError((u, v))
+        return float(self._weight[slot])
+
+    def min_weight(self):
+        """Smallest edge weight, or None for an edgeless graph"""
+        if not self._m:
+            return None
+        return float(self._weight[:self._m].min())
+
+    def add_edge(self, u, v, weight):
+        """Add u -> v by name (creating missing nodes) or update its weight"""
+        # Re-weighting looks the slot up without forcing the slot map, so the
+        # first edit after a bulk load stays cheap
+        known = u in self.ids and v in self.ids
+        ui, vi = self.add_node(u), self.add_node(v)
+        slot = self.edge_slot(u, v) if known else None
+        if slot is None:
+            slots = self._edge_slots()
+            self._reserve(1)
+            slot = self._m
+            self._src[slot] = ui
+            self._dst[slot] = vi
+            self._weight[slot] = weight
+            self._m += 1
+            slots[(ui, vi)] = slot
+            self._touch()
+            self._emit(EDGE_ADDED, slot)
+        else:
+            # Same structure, so the cached CSR views are patched, not dropped
+            self._weight[slot] = weight
+            self._patch_weight(slot)
+            self.version += 1
+            self._emit(WEIGHT_CHANGED, slot)
+
+    def add_edges(self, src, dst, weight):
+        """Bulk-add edges given as id arrays; later duplicates win, like add_edge"""
+        src = np.asarray(src, dtype=ID_DTYPE)
+        dst = np.asarray(dst, dtype=ID_DTYPE)
+        weight = np.asarray(weight, dtype=np.float64)
+        if not len(src):
+            return
+        self._reserve(len(src))
+        m, k = self._m, len(src)
+        self._src[m:m + k] = src
+        self._dst[m:m + k] = dst
+        self._weight[m:m + k] = weight
+        self._m = m + k
+        self._dedupe()
+        self._slots = None
+        self._touch()
+        self._emit(CLEARED)
+
+    def remove_edge(self, u, v):
+        """Remove u -> v by name; the last slot is moved into the hole"""
+        ui, vi = self.ids[u], self.ids[v]
+        slots = self._edge_slots()
+        slot = slots.pop((ui, vi))
+        last = self._m - 1
+        if slot != last:
+            self._src[slot] = self._src[last]
+            self._dst[slot] = self._dst[last]
+            self._weight[slot] = self._weight[last]
+            slots[(int(self._src[slot]), int(self._dst[slot]))] = slot
+        self._m = last
+        self._touch()
+        self._emit(EDGE_REMOVED, (slot, ui, vi))
+
+    def load_arrays(self, names, src, dst, weight, csr=None, reverse=None):
+        """Replace the whole graph with prebuilt arrays (e.g. memory-mapped ones).
+
+        The arrays are adopted as-is, not copied; CSR views may be passed in
+        so they do not have to be rebuilt. The first growth copies them.
+        """
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self._src, self._dst, self._weight = src, dst, weight
+        self._m = len(src)
+        self._slots = None
+        self._touch()
+        self._csr = csr
+        self._reverse = reverse
+        self._emit(CLEARED)
+
+    def clear_edges(self):
+        # Fresh arrays also release any memory-mapped file backing the old ones
+        self._src = np.empty(16, dtype=ID_DTYPE)
+        self._dst = np.empty(16, dtype=ID_DTYPE)
+        self._weight = np.empty(16)
+        self._m = 0
+        self._slots = None
+        self._touch()
+        self._emit(CLEARED)
+
+    def clear(self):
+        with self.batch():
+            self.names = []
+            self.ids = {}
+            self.clear_edges()
+
+    # -- change events -----------------------------------------------------
+
+    def subscribe(self, listener):
+        """Call listener(event, index) after every change (see NODE_ADDED etc.)"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    @contextmanager
+    def batch(self):
+        """Hold back per-item events during a bulk edit and emit one CLEARED at the end"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            self._emit(CLEARED)
+
+    # -- derived views -----------------------------------------------------
+
+    def csr(self):
+        """Forward CSR (out-edges), cached until the next mutation"""
+        if self._csr is None:
+            src, dst, weight = self.edge_arrays()
+            self._csr = build_csr(len(self.names), src, dst, weight)
+        return self._csr
+
+    def reverse_csr(self):
+        """Reverse CSR (in-edges), cached until the next mutation"""
+        if self._reverse is None:
+            src, dst, weight = self.edge_arrays()
+            self._reverse = build_csr(len(self.names), dst, src, weight)
+        return self._reverse
+
+    def content_hash(self):
+        """Digest of the node names and edges, for indexes persisted across sessions.
+
+        Unlike version it survives a save and reload, so a file built for
+        this exact graph can be recognised. It is canonical: the sorted
+        names and the (u, v, weight) edges sorted by name, so neither the
+        order nodes and edges came in nor remove_edge's slot reuse changes
+        it. Indexes by node id must also match id_hash(). Cached until the
+        next mutation.
+        """
+        if self._hash is None or self._hash[0] != self.version:
+            names = np.array(self.names, dtype=str)
+            order = np.argsort(names, kind='stable')
+            rank = np.empty(len(names), dtype=np.int64)
+            rank[order] = np.arange(len(names))
+            src, dst, weight = self.edge_arrays()
+            src, dst = rank[src], rank[dst]
+            edges = np.lexsort((dst, src))
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update("\0".join(names[order].tolist()).encode())
+            for array in (src[edges], dst[edges], np.asarray(weight, dtype=np.float64)[edges]):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            self._hash = (self.version, digest.hexdigest())
+        return self._hash[1]
+
+    def id_hash(self):
+        """Digest of the node names in id order: an index by node id (a
+        layout, a hierarchy) fits a graph whose content_hash() and
+        id_hash() both match"""
+        return hashlib.blake2b("\0".join(self.names).encode(), digest_size=16).hexdigest()
+
+    def to_networkx(self):
+        """Materialise an nx.DiGraph with 'weight' edge attributes"""
+        import networkx as nx
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self.names)
+        graph.add_weighted_edges_from(self.edges())
+        return graph
+
+    # -- internals ---------------------------------------------------------
+
+    def _touch(self):
+        self.version += 1
+        self._csr = None
+        self._reverse = None
+
+    def _emit(self, event, index=None):
+        if self._batch_depth:
+            return
+        for listener in list(self._listeners):
+            listener(event, index)
+
+    def _patch_weight(self, slot):
+        """Copy the weight of slot into the cached CSR views, if any"""
+        weight = self._weight[slot]
+        for csr, row in ((self._csr, self._src[slot]), (self._reverse, self._dst[slot])):
+            if csr is not None:
+                lo, hi = csr.row(row)
+                csr.weights[lo + np.flatnonzero(csr.edge_ids[lo:hi] == slot)[0]] = weight
+
+    def _reserve(self, extra):
+        needed = self._m + extra
+        capacity = len(self._src)
+        if needed <= capacity:
+            return
+        capacity = max(capacity, 16)
+        while capacity < needed:
+            capacity *= 2
+        for attr in ('_src', '_dst', '_weight'):
+            old = getattr(self, attr)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._m] = old[:self._m]
+            setattr(self, attr, new)
+
+    def _edge_slots(self):
+        if self._slots is None:
+            src, dst, _ = self.edge_arrays()
+            self._slots = {(u, v): slot for slot, (u, v) in enumerate(zip(src.tolist(), dst.tolist()))}
+        return self._slots
+
+    def _dedupe(self):
+        """Keep only the last occurrence of each (u, v), preserving slot order"""
+        src, dst, _ = self.edge_arrays()
+        keys = src.astype(np.int64) * max(len(self.names), 1) + dst
+        _, last_rev = np.unique(keys[::-1], return_index=True)
+        if len(last_rev) == len(keys):
+            return
+        keep = np.sort(len(keys) - 1 - last_rev)
+        k = len(keep)
+        self._src[:k] = self._src[keep]
+        self._dst[:k] = self._dst[keep]
+        self._weight[:k] = self._weight[keep]
+        self._m = k
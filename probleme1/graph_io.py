@@ -0,0 +1,351 @@
+import csv
+import json
+import os
+from itertools import islice
+import numpy as np
+from .contraction import ContractionHierarchy
+from .graph_core import CSR, Graph, ID_DTYPE
+
+# Rows are parsed in batches of this many lines: large enough for the
+# vectorised float conversion to pay off, small enough to bound memory.
+CHUNK_ROWS = 65536
+# How many invalid rows the summary spells out before just counting them
+MAX_REPORTED_ERRORS = 10
+
+
+class LoadReport:
+    """Outcome of a CSV load: graph size plus every rejected row with its line number"""
+
+    def __init__(self, path):
+        self.path = path
+        self.nodes = 0
+        self.edges = 0
+        self.errors = []  # (line number, message)
+
+    def summary(self):
+        text = f"Loaded {self.nodes} nodes and {self.edges} edges from {self.path}"
+        if self.errors:
+            text += f"\n{len(self.errors)} invalid row(s) skipped:"
+            for line, message in self.errors[:MAX_REPORTED_ERRORS]:
+                text += f"\n  line {line}: {message}"
+            if len(self.errors) > MAX_REPORTED_ERRORS:
+                text += f"\n  ... and {len(self.errors) - MAX_REPORTED_ERRORS} more"
+        return text
+
+
+def load_csv(path, graph=None, chunk_rows=CHUNK_ROWS):
+    """Stream a graph CSV into graph (cleared first) or a new Graph.
+
+    One-field rows declare a node, three-field rows an edge "u,v,weight".
+    Weights are converted per chunk with NumPy, and all edges are added in
+    one batch at the end. Works headless; returns (graph, LoadReport).
+    """
+    if graph is None:
+        graph = Graph()
+    # Listeners get a single CLEARED once the load is done (or has failed)
+    with graph.batch():
+        graph.clear()
+        report = LoadReport(path)
+
+        src_chunks, dst_chunks, weight_chunks = [], [], []
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            first_line = 1
+            while True:
+                rows = list(islice(reader, chunk_rows))
+                if not rows:
+                    break
+                edges = _parse_chunk(graph, rows, first_line, report)
+                first_line += len(rows)
+                if edges is not None:
+                    src_chunks.append(edges[0])
+                    dst_chunks.append(edges[1])
+                    weight_chunks.append(edges[2])
+
+        if src_chunks:
+            graph.add_edges(np.concatenate(src_chunks), np.concatenate(dst_chunks),
+                            np.concatenate(weight_chunks))
+    report.errors.sort()
+    report.nodes = graph.number_of_nodes()
+    report.edges = graph.number_of_edges()
+    return graph, report
+
+
+def _parse_chunk(graph, rows, first_line, report):
+    """Intern the nodes of one chunk and return its edges as id/weight arrays"""
+    # Convert every weight of the chunk in one go first, so rows with a bad
+    # weight are rejected before their endpoints get interned
+    edge_rows = [i for i, row in enumerate(rows) if len(row) == 3]
+    texts = [rows[i][2] for i in edge_rows]
+    try:
+        weights = np.asarray(texts, dtype=np.float64)
+    except ValueError:
+        # Only a chunk with a bad weight pays for the per-row fallback
+        weights = np.empty(len(texts))
+        valid = np.ones(len(texts), dtype=bool)
+        for k, text in enumerate(texts):
+            try:
+                weights[k] = float(text)
+            except ValueError:
+                valid[k] = False
+                report.errors.append((first_line + edge_rows[k], f"invalid edge weight: {text!r}"))
+        edge_rows = [i for i, ok in zip(edge_rows, valid.tolist()) if ok]
+        weights = weights[valid]
+
+    # Flatten node names in file order (u then v for edges) so ids are
+    # assigned exactly as row-by-row insertion would
+    if len(edge_rows) == len(rows):
+        # Fast path for the common all-edges chunk
+        names = [None] * (2 * len(rows))
+        names[0::2] = [row[0].strip() for row in rows]
+        names[1::2] = [row[1].strip() for row in rows]
+        positions = range(0, len(names), 2)
+    else:
+        names, positions = [], []
+        edge_set = set(edge_rows)
+        for i, row in enumerate(rows):
+            if i in edge_set:
+                positions.append(len(names))
+                names.append(row[0].strip())
+                names.append(row[1].strip())
+            elif len(row) == 1:
+                names.append(row[0].strip())
+            elif row and len(row) != 3:  # Empty lines are skipped silently
+                report.errors.append((first_line + i, f"expected 1 or 3 fields, got {len(row)}"))
+
+    # Dict lookups in bulk; only names seen for the first time go through add_node
+    get = graph.ids.get
+    found = [get(name) for name in names]
+    if None in found:
+        for k, node in enumerate(found):
+            if node is None:
+                found[k] = graph.add_node(names[k])
+    if not edge_rows:
+        return None
+
+    found = np.array(found, dtype=ID_DTYPE)
+    positions = np.asarray(positions, dtype=np.int64)
+    return found[positions], found[positions + 1], weights
+
+
+# -- binary format -------------------------------------------------------
+#
+# A .npgraph file is an 8-byte magic and a little-endian uint64 offset of a
+# JSON footer, followed by raw arrays aligned to 64 bytes and the footer.
+# The footer records each array's dtype, length and byte offset, so every
+# array can be opened with np.memmap and paged in lazily. Node names are
+# stored as one NUL-separated UTF-8 blob (the csv module rejects NUL bytes,
+# so no CSV-loaded name can contain one).
+
+BINARY_SUFFIX = ".npgraph"
+BINARY_MAGIC = b"PRGRAPH1"
+BINARY_ALIGN = 64
+
+
+def save_binary(graph, path, source=None, errors=()):
+    """Write graph (edge slots plus forward/reverse CSR) to a .npgraph file.
+
+    source and errors are only used for CSV sidecar caches: the source file
+    stamp it was built from and the rows the CSV parse rejected. The file is
+    written to a temporary name first so readers never see a partial file.
+    """
+    src, dst, weight = graph.edge_arrays()
+    csr, reverse = graph.csr(), graph.reverse_csr()
+    arrays = {
+        'names': np.frombuffer("\0".join(graph.names).encode(), dtype=np.uint8),
+        'src': src, 'dst': dst, 'weight': weight,
+        'csr_offsets': csr.offsets, 'csr_targets': csr.targets,
+        'csr_weights': csr.weights, 'csr_edge_ids': csr.edge_ids,
+        'rev_offsets': reverse.offsets, 'rev_targets': reverse.targets,
+        'rev_weights': reverse.weights, 'rev_edge_ids': reverse.edge_ids,
+    }
+
+    layout, offset = {}, BINARY_ALIGN
+    for key, array in arrays.items():
+        layout[key] = {'dtype': array.dtype.str, 'length': len(array), 'offset': offset}
+        offset += -(-array.nbytes // BINARY_ALIGN) * BINARY_ALIGN
+    footer = json.dumps({'nodes': graph.number_of_nodes(), 'arrays': layout,
+                         'source': source, 'errors': list(errors)}).encode()
+
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(BINARY_MAGIC)
+        f.write(np.array(offset, dtype='<u8').tobytes())
+        for key, array in arrays.items():
+            f.seek(layout[key]['offset'])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.seek(offset)
+        f.write(footer)
+    os.replace(tmp, path)
+
+
+def read_binary_footer(path):
+    with open(path, 'rb') as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a {BINARY_SUFFIX} graph file")
+        f.seek(int(np.frombuffer(f.read(8), dtype='<u8')[0]))
+        return json.loads(f.read())
+
+
+def load_binary(path, graph=None):
+    """Open a .npgraph file with every edge array memory-mapped.
+
+    Arrays are mapped copy-on-write, so edits made later in the editor stay
+    private to the process and never touch the file. Returns (graph, LoadReport).
+    """
+    if graph is None:
+        graph = Graph()
+    footer = read_binary_footer(path)
+
+    def mapped(key):
+        spec = footer['arrays'][key]
+        if not spec['length']:
+            return np.empty(0, dtype=spec['dtype'])
+        # Plain ndarray views of the mapping: np.memmap's per-slice overhead
+        # would otherwise show up in every search over the CSR
+        return np.asarray(np.memmap(path, dtype=spec['dtype'], mode='c',
+                                    offset=spec['offset'], shape=(spec['length'],)))
+
+    names = mapped('names').tobytes().decode().split("\0") if footer['nodes'] else []
+    csr = CSR(mapped('csr_offsets'), mapped('csr_targets'), mapped('csr_weights'), mapped('csr_edge_ids'))
+    reverse = CSR(mapped('rev_offsets'), mapped('rev_targets'), mapped('rev_weights'), mapped('rev_edge_ids'))
+    graph.load_arrays(names, mapped('src'), mapped('dst'), mapped('weight'), csr, reverse)
+
+    report = LoadReport(path)
+    report.nodes = graph.number_of_nodes()
+    report.edges = graph.number_of_edges()
+    report.errors = [tuple(error) for error in footer.get('errors', [])]
+    return graph, report
+
+
+def sidecar_path(csv_path):
+    return csv_path + BINARY_SUFFIX
+
+
+def load_graph_file(path, graph=None, use_cache=True):
+    """Load a .npgraph or .csv graph; CSVs go through a binary sidecar cache.
+
+    The sidecar (<file>.csv.npgraph) is reused while it matches the CSV's
+    size and modification time, and rebuilt from the CSV otherwise. Failing
+    to write the sidecar (e.g. a read-only folder) is not an error.
+    """
+    if path.endswith(BINARY_SUFFIX):
+        return load_binary(path, graph)
+    if not use_cache:
+        return load_csv(path, graph)
+
+    stat = os.stat(path)
+    source = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+    cache = sidecar_path(path)
+    try:
+        if read_binary_footer(cache).get('source') == source:
+            graph, report = load_binary(cache, graph)
+            report.path = path
+            return graph, report
+    except (OSError, ValueError):
+        pass  # Missing or unreadable cache: rebuild it below
+
+    graph, report = load_csv(path, graph)
+    try:
+        save_binary(graph, cache, source, report.errors)
+    except OSError:
+        pass
+    return graph, report
+
+
+# -- layouts -------------------------------------------------------------
+
+LAYOUT_SUFFIX = ".layout.npz"
+
+
+def layout_path(graph_path):
+    return graph_path + LAYOUT_SUFFIX
+
+
+def save_layout(graph_path, graph, positions):
+    """Store node positions next to a saved graph, with the graph's content and id hashes"""
+    tmp = f"{layout_path(graph_path)}.tmp.npz"
+    np.savez(tmp, positions=positions, content_hash=np.array(graph.content_hash()),
+             id_hash=np.array(graph.id_hash()))
+    os.replace(tmp, layout_path(graph_path))
+
+
+def load_layout(graph_path, graph):
+    """Positions saved for graph_path, or None if missing or laid out for other
+    content or other node ids"""
+    try:
+        with np.load(layout_path(graph_path)) as data:
+            if str(data['content_hash']) != graph.content_hash() or str(data['id_hash']) != graph.id_hash():
+                return None
+            return data['positions']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# -- contraction hierarchies ---------------------------------------------
+
+HIERARCHY_SUFFIX = ".ch.npz"
+
+
+def hierarchy_path(graph_path):
+    return graph_path + HIERARCHY_SUFFIX
+
+
+def save_hierarchy(graph_path, hierarchy):
+    """Store a contraction hierarchy next to a saved graph"""
+    tmp = f"{hierarchy_path(graph_path)}.tmp.npz"
+    hierarchy.save(tmp)
+    os.replace(tmp, hierarchy_path(graph_path))
+
+
+def load_hierarchy(graph_path, graph):
+    """Hierarchy saved for graph_path, or None if missing or built for other
+    content or other node ids"""
+    try:
+        hierarchy = ContractionHierarchy.load(hierarchy_path(graph_path))
+    except (OSError, ValueError, KeyError):
+        return None
+    if hierarchy.content_hash != graph.content_hash() or hierarchy.id_hash != graph.id_hash():
+        return None
+    hierarchy.version = graph.version
+    return hierarchy
+
+
+# -- shortest-path trees -------------------------------------------------
+
+TREE_SUFFIX = ".npy"
+
+
+def save_tree(path, names, tree):
+    """Export a TreeResult (see path_solver) as CSV, or as NPY for a .npy path.
+
+    The CSV has one "node,distance,predecessor,hops" row per node, with
+    empty cells where there is no value (unreached nodes, the source's
+    predecessor), written CHUNK_ROWS rows at a time. The NPY file is one
+    structured array in node id order with fields node, dist, pred and
+    hops, pred being a row index. Either is written to a temporary name first.
+    """
+    if path.endswith(TREE_SUFFIX):
+        width = max((len(name) for name in names), default=1)
+        table = np.empty(len(names), dtype=[('node', f'U{width}'), ('dist', '<f8'),
+                                            ('pred', '<i8'), ('hops', '<i8')])
+        table['node'], table['dist'], table['pred'], table['hops'] = names, tree.dist, tree.pred, tree.hops
+        tmp = f"{path}.tmp{TREE_SUFFIX}"
+        np.save(tmp, table)
+        os.replace(tmp, path)
+        return
+
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["node", "distance", "predecessor", "hops"])
+        for lo in range(0, len(names), CHUNK_ROWS):
+            hi = min(lo + CHUNK_ROWS, len(names))
+            dist = tree.dist[lo:hi].tolist()
+            pred = tree.pred[lo:hi].tolist()
+            hops = tree.hops[lo:hi].tolist()
+            writer.writerows(
+                (names[node], "", "", "") if hops[k] < 0 else
+                (names[node], dist[k], names[pred[k]] if pred[k] >= 0 else "", hops[k])
+                for k, node in enumerate(range(lo, hi)))
+    os.replace(tmp, path)
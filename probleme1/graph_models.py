@@ -0,0 +1,238 @@
+import math
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from .graph_core import NODE_ADDED, EDGE_ADDED, WEIGHT_CHANGED, EDGE_REMOVED, CLEARED
+
+# Table models that read straight from a Graph: the view only asks for the
+# cells it is about to paint, so nothing is copied per row and a 100k-edge
+# graph costs no more to show than a 10-edge one. Models subscribe to the
+# graph's change events and emit targeted row signals for single edits.
+
+
+class GraphTableModel(QAbstractTableModel):
+    """Read-only table over a Graph; subclasses define headers, row_count and cell"""
+    headers = ()
+
+    def __init__(self, graph, parent=None):
+        super().__init__(parent)
+        self.graph = graph
+        self._rows = self.row_count()
+        graph.subscribe(self.on_graph_event)
+
+    def row_count(self):
+        raise NotImplementedError
+
+    def cell(self, row, column):
+        raise NotImplementedError
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid() or index.row() >= self._rows:
+            return QVariant()
+        return self.cell(index.row(), index.column())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return QVariant()
+
+    def on_graph_event(self, event, index):
+        if event == CLEARED:
+            self.reset()
+
+    def sync_rows(self):
+        """Announce rows appended to or dropped from the end since the last sync"""
+        rows = self.row_count()
+        if rows > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, rows - 1)
+            self._rows = rows
+            self.endInsertRows()
+        elif rows < self._rows:
+            self.beginRemoveRows(QModelIndex(), rows, self._rows - 1)
+            self._rows = rows
+            self.endRemoveRows()
+
+    def row_changed(self, row):
+        """Repaint a single row whose values changed in place"""
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.headers) - 1))
+
+    def reset(self):
+        """Resync after a bulk change (load, clear, matrix edit)"""
+        self.beginResetModel()
+        self._rows = self.row_count()
+        self.endResetModel()
+
+
+class NodeTableModel(GraphTableModel):
+    headers = ("Node",)
+
+    def row_count(self):
+        return self.graph.number_of_nodes()
+
+    def on_graph_event(self, event, index):
+        if event == NODE_ADDED:
+            self.sync_rows()
+        else:
+            super().on_graph_event(event, index)
+
+    def cell(self, row, column):
+        return self.graph.names[row]
+
+
+class EdgeTableModel(GraphTableModel):
+    """One row per edge slot, so a slot number is also the row to repaint"""
+    headers = ("From", "To", "Weight")
+
+    def row_count(self):
+        return self.graph.number_of_edges()
+
+    def on_graph_event(self, event, index):
+        if event == EDGE_ADDED:
+            self.sync_rows()
+        elif event == WEIGHT_CHANGED:
+            self.row_changed(index)
+        elif event == EDGE_REMOVED:
+            # The last row moved into the vacated slot
+            slot, _, _ = index
+            self.sync_rows()
+            if slot < self._rows:
+                self.row_changed(slot)
+        else:
+            super().on_graph_event(event, index)
+
+    def cell(self, row, column):
+        src, dst, weight = self.graph.edge_arrays()
+        if column == 0:
+            return self.graph.names[src[row]]
+        if column == 1:
+            return self.graph.names[dst[row]]
+        return str(float(weight[row]))
+
+
+class TreeTableModel(QAbstractTableModel):
+    """One row per node of a shortest-path tree (a TreeResult), read straight
+    from its arrays. Sorting only permutes a row order array, so a
+    million-node tree sorts and scrolls without building any rows."""
+    headers = ("Node", "Distance", "Predecessor", "Hops")
+
+    def __init__(self, names, tree, parent=None):
+        super().__init__(parent)
+        self.names = names
+        self.tree = tree
+        self.order = np.arange(len(tree.dist))  # Row -> node id
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return QVariant()
+        node = int(self.order[index.row()])
+        if index.column() == 0:
+            return self.names[node]
+        if self.tree.hops[node] < 0:
+            return "unreachable" if index.column() == 1 else ""
+        if index.column() == 1:
+            return f"{self.tree.dist[node]:g}"
+        if index.column() == 2:
+            pred = self.tree.pred[node]
+            return self.names[pred] if pred >= 0 else ""
+        return str(self.tree.hops[node])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return QVariant()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column == 0:
+            keys = np.array(self.names)
+        elif column == 2:
+            # By predecessor name; the source and unreached nodes sort first
+            pred = self.tree.pred
+            keys = np.where(pred >= 0, np.array(self.names)[np.maximum(pred, 0)], "")
+        else:
+            # Unreached nodes (inf, -1 hops) sort after every reached one
+            keys = self.tree.dist if column == 1 else np.where(self.tree.hops < 0, np.iinfo(np.int64).max,
+                                                                 self.tree.hops)
+        self.layoutAboutToBeChanged.emit()
+        self.order = np.argsort(keys, kind='stable')
+        if order == Qt.DescendingOrder:
+            self.order = self.order[::-1]
+        self.layoutChanged.emit()
+
+
+class AdjacencyMatrixModel(QAbstractTableModel):
+    """Editable V x V weight matrix over a graph, where 0 means "no edge".
+
+    Nothing is stored per cell: a painted cell looks its weight up in the
+    graph's CSR row, and edits are kept in a sparse dict until changes()
+    turns them into the edge additions, updates and removals to apply.
+    """
+
+    def __init__(self, nodes, graph=None, parent=None):
+        super().__init__(parent)
+        self.nodes = nodes
+        self.graph = graph
+        self.edits = {}  # (row, column) -> weight typed in the dialog
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.nodes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.nodes)
+
+    def weight(self, row, column):
+        if (row, column) in self.edits:
+            return self.edits[(row, column)]
+        return self.graph_weight(row, column)
+
+    def graph_weight(self, row, column):
+        if self.graph is None:
+            return 0.0
+        slot = self.graph.edge_slot(self.nodes[row], self.nodes[column])
+        return 0.0 if slot is None else float(self.graph.edge_arrays()[2][slot])
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.EditRole) or not index.isValid():
+            return QVariant()
+        weight = self.weight(index.row(), index.column())
+        return str(weight) if weight else "0"
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        try:
+            weight = float(value)
+        except ValueError:
+            return False  # Keep the previous value, like an unparsable cell used to be ignored
+        if not math.isfinite(weight):
+            return False  # nan and inf parse, but no engine can compare them
+        self.edits[(index.row(), index.column())] = weight
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return self.nodes[section]
+        return QVariant()
+
+    def changes(self):
+        """Edited cells that differ from the graph: {(u, v): weight, or None to remove}"""
+        changes = {}
+        for (row, column), weight in self.edits.items():
+            if weight == self.graph_weight(row, column):
+                continue
+            changes[(self.nodes[row], self.nodes[column])] = weight if weight else None
+        return changes
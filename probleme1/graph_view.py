@@ -0,0 +1,119 @@
+import math
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QDialog, QVBoxLayout
+from .layout import spring_layout
+
+# Level of detail: node labels, edge labels and arrows are only drawn once
+# the view is zoomed in far enough that at most this many items are visible.
+LABEL_MAX_NODES = 200
+LABEL_MAX_EDGES = 150
+# Range changes are coalesced so dragging does not rebuild labels per frame
+DETAIL_DELAY_MS = 50
+
+
+class GraphViewDialog(QDialog):
+    """pyqtgraph view of a Graph: all edges in one line item, all nodes in one
+    scatter item, with labels and arrows added only for the zoomed-in part"""
+
+    def __init__(self, graph, colors=None, parent=None, path=None, positions=None):
+        super().__init__(parent)
+        self.setWindowTitle("Graph View")
+        self.resize(600, 500)
+        self.graph = graph
+        self.path = path or []  # Solved shortest path (node names) to highlight
+        self.colors = colors or {
+            "primary": "#4a6da7",
+            "secondary": "#6c5ce7",
+            "success": "#00b894",
+            "danger": "#d63031",
+            "warning": "#fdcb6e",
+            "dark": "#2d3436",
+            "light": "#dfe6e9",
+            "background": "#1e1e2e",
+            "card": "#2a2a3a",
+            "text": "#ffffff"
+        }
+        layout = QVBoxLayout(self)
+        self.plot = pg.PlotWidget(background=self.colors['background'])
+        self.plot.setAspectLocked(True)
+        self.plot.hideAxis('left')
+        self.plot.hideAxis('bottom')
+        self.plot.setMenuEnabled(False)
+        self.plot.getViewBox().setDefaultPadding(0.08)  # Room for the labels of outer nodes
+        layout.addWidget(self.plot)
+
+        self.detail_items = []
+        self.detail_timer = QTimer(self)
+        self.detail_timer.setSingleShot(True)
+        self.detail_timer.setInterval(DETAIL_DELAY_MS)
+        self.detail_timer.timeout.connect(self.update_details)
+        self.plot.getViewBox().sigRangeChanged.connect(lambda *_: self.detail_timer.start())
+
+        if positions is None:
+            src, dst, _ = graph.edge_arrays()
+            positions = spring_layout(graph.number_of_nodes(), src, dst)
+        self.pos = positions
+        self.draw_graph()
+
+    def draw_graph(self):
+        src, dst, _ = self.graph.edge_arrays()
+        self.src, self.dst = src.astype(np.intp), dst.astype(np.intp)
+        self.midpoints = (self.pos[self.src] + self.pos[self.dst]) / 2
+
+        # One line item for every edge: consecutive points form one segment
+        self.plot.addItem(self.segments(self.src, self.dst, self.colors['secondary'], 1))
+        if self.path:
+            ids = np.array([self.graph.ids[name] for name in self.path], dtype=np.intp)
+            self.plot.addItem(self.segments(ids[:-1], ids[1:], self.colors['warning'], 3))
+
+        self.plot.addItem(pg.ScatterPlotItem(pos=self.pos, size=8, pen=None,
+                                             brush=self.colors['primary']))
+        if self.path:
+            self.plot.addItem(pg.ScatterPlotItem(pos=self.pos[ids], size=11, pen=None,
+                                                 brush=self.colors['success']))
+        self.update_details()
+
+    def segments(self, src, dst, color, width):
+        points = np.empty((2 * len(src), 2))
+        points[0::2] = self.pos[src]
+        points[1::2] = self.pos[dst]
+        return pg.PlotCurveItem(points[:, 0], points[:, 1], connect='pairs', antialias=False,
+                                pen=pg.mkPen(color, width=width), skipFiniteCheck=True)
+
+    def update_details(self):
+        """Rebuild labels and arrows for what is in view, if few enough items are"""
+        for item in self.detail_items:
+            self.plot.removeItem(item)
+        self.detail_items = []
+        (x0, x1), (y0, y1) = self.plot.getViewBox().viewRange()
+
+        def visible(points):
+            return np.flatnonzero((points[:, 0] >= x0) & (points[:, 0] <= x1)
+                                  & (points[:, 1] >= y0) & (points[:, 1] <= y1))
+
+        nodes = visible(self.pos)
+        if len(nodes) <= LABEL_MAX_NODES:
+            for node in nodes.tolist():
+                self.add_detail(pg.TextItem(self.graph.names[node], color=self.colors['text'],
+                                            anchor=(0.5, 1.3)), self.pos[node])
+
+        edges = visible(self.midpoints)
+        if len(edges) <= LABEL_MAX_EDGES:
+            weights = self.graph.edge_arrays()[2]
+            for slot in edges.tolist():
+                start, end = self.pos[self.src[slot]], self.pos[self.dst[slot]]
+                self.add_detail(pg.TextItem(f"{weights[slot]:g}", color=self.colors['warning'],
+                                            anchor=(0.5, 0.5)), self.midpoints[slot])
+                # The arrow sits just short of the target node, pointing at it;
+                # its angle is in screen space, where y grows downwards
+                dx, dy = end - start
+                self.add_detail(pg.ArrowItem(angle=math.degrees(math.atan2(dy, -dx)),
+                                             headLen=14, pen=None, brush=self.colors['light']),
+                                start + 0.9 * (end - start))
+
+    def add_detail(self, item, pos):
+        item.setPos(float(pos[0]), float(pos[1]))
+        self.plot.addItem(item)
+        self.detail_items.append(item)
@@ -1,82 +1,101 @@
 import gurobipy as grb
 from PyQt5.QtWidgets import QMessageBox, QStatusBar, QTextEdit
-import networkx as nx
+from .path_solver import ENGINES, NEGATIVE_CYCLE, NO_PATH, SolveError, ShortestPathSolver  # ENGINES and SolveError kept importable from here
 
-class GurobiSolver:
-    def __init__(self, graph, status_bar: QStatusBar, result_text: QTextEdit, start_node, end_node):
-        self.graph = graph
+
+class GurobiSolver(ShortestPathSolver):
+    """GUI adapter over ShortestPathSolver: solves the start/end pair picked in
+    the window and shows results in its status bar and results panel, and
+    the solve statistics in stats_panel when one is given"""
+
+    def __init__(self, graph, status_bar: QStatusBar, result_text: QTextEdit, start_node, end_node,
+                 engine="auto", verify=False, stats_panel=None, cache=None):
+        super().__init__(graph, engine, verify, cache)
         self.status_bar = status_bar
         self.result_text = result_text
+        self.stats_panel = stats_panel
         self.start_node = start_node  # Start node
         self.end_node = end_node      # End node
 
-    def solve(self):
-        if not self.graph.nodes:
-            self.display_error("The graph is empty. Cannot solve the problem.")
-            return
+    def run(self, worker=None):
+        """Solve the selected pair without touching any widget.
+
+        Safe to call from a SolveWorker thread; raises SolveError when there
+        is nothing to show and returns the PathResult otherwise (optimal, or
+        the negative cycle that rules out a shortest path).
+        """
+        result = self.find_path(self.start_node, self.end_node, worker)
+        if result.status == NO_PATH:
+            raise SolveError("No optimal solution found.")
+        return result
 
+    def run_k(self, k, worker=None):
+        """Like run(), for the k cheapest loopless paths (a list of PathResults)"""
+        results = self.find_paths(self.start_node, self.end_node, k, worker)
+        if not results:
+            raise SolveError("No optimal solution found.")
+        return results
+
+    def solve(self):
         try:
-            model = grb.Model("ShortestPath")
-            model.setParam('OutputFlag', 0)  # Disable Gurobi output
-
-            # Add binary variables for each directed edge
-            variables = {}
-            for u, v in self.graph.edges:
-                variables[(u, v)] = model.addVar(vtype=grb.GRB.BINARY, name=f"x_{u}_{v}")
-
-            # Objective function: minimize total weight of selected edges
-            model.setObjective(
-                grb.quicksum(variables[(u, v)] * self.graph[u][v]['weight']
-                            for u, v in self.graph.edges),
-                sense=grb.GRB.MINIMIZE
-            )
-
-            # Flow constraints:
-            for node in self.graph.nodes:
-                inflow = grb.quicksum(variables[(u, v)] for (u, v) in self.graph.edges if v == node)
-                outflow = grb.quicksum(variables[(u, v)] for (u, v) in self.graph.edges if u == node)
-
-                if node == self.start_node:
-                    model.addConstr(outflow - inflow == 1, name=f"flow_start_{node}")
-                elif node == self.end_node:
-                    model.addConstr(outflow - inflow == -1, name=f"flow_end_{node}")
-                else:
-                    model.addConstr(outflow - inflow == 0, name=f"flow_{node}")
-
-            # Solve the model
-            model.optimize()
-
-            if model.status == grb.GRB.OPTIMAL:
-                result = "Optimal path:\n"
-                current_node = self.start_node
-                path = [current_node]
-                total_weight = 0
-
-                # Trace the ordered path and collect weights of each step
-                steps = []
-                while current_node != self.end_node:
-                    for (u, v) in self.graph.edges:
-                        if u == current_node and variables[(u, v)].x > 0.5:
-                            step_weight = self.graph[u][v]['weight']
-                            total_weight += step_weight
-                            path.append(v)
-                            steps.append(f"{u} → {v} (Weight: {step_weight})")
-                            current_node = v
-                            break
-
-                # Format the result
-                path_str = " → ".join(str(node) for node in path)
-                step_details = "\n".join(steps)
-                result += f"Path: {path_str}\nSteps:\n{step_details}\nTotal weight: {total_weight}"
-                self.result_text.setPlainText(result)
-                self.status_bar.showMessage("Solution found successfully!", 3000)
-            else:
-                self.display_error("No optimal solution found.")
-
-        except grb.GurobiError as e:
-            self.display_error(f"Gurobi error: {e}")
+            self.display_result(self.run())
         except Exception as e:
-            self.display_error(f"An error occurred: {e}")
+            self.display_failure(e)
+
+    def format_result(self, result):
+        """Format a PathResult as the results panel text"""
+        steps = "\n".join(f"{u} → {v} (Weight: {weight})" for u, v, weight in result.steps)
+        path = " → ".join(str(node) for node in result.path)
+        if result.status == NEGATIVE_CYCLE:
+            return (f"Negative cycle: no shortest path exists, every lap makes the route cheaper.\n"
+                    f"Cycle: {path}\nSteps:\n{steps}\nCycle weight: {result.objective}")
+        return f"Optimal path:\nPath: {path}\nSteps:\n{steps}\nTotal weight: {result.objective}"
+
+    def format_k_results(self, results):
+        """Format ranked PathResults as the results panel text"""
+        sections = []
+        for rank, result in enumerate(results, 1):
+            steps = "\n".join(f"{u} → {v} (Weight: {weight})" for u, v, weight in result.steps)
+            sections.append(f"#{rank} — Total weight: {result.objective}\n"
+                            f"Path: {' → '.join(str(node) for node in result.path)}\nSteps:\n{steps}")
+        return f"{len(results)} shortest path(s):\n\n" + "\n\n".join(sections)
+
+    def display_result(self, result):
+        """Show a solved PathResult in the results panel"""
+        self.result_text.setPlainText(self.format_result(result))
+        self.display_stats(result)
+        self.status_bar.showMessage(self.status_message(result), 3000)
+
+    def status_message(self, result):
+        if result.status == NEGATIVE_CYCLE:
+            return "Negative cycle found"
+        return "Solution found successfully!"
+
+    def display_path(self, path):
+        """Show a node path from the all-pairs index, saying that it came from there"""
+        self.display_result(self.path_result(path, {'engine': "all-pairs index"}))
+        self.result_text.append("\nAnswered from the all-pairs index, not the selected engine or the "
+                                "result cache. The index is dropped on the next graph edit.")
+
+    def display_results(self, results):
+        """Show ranked alternatives from run_k() in the results panel"""
+        self.result_text.setPlainText(self.format_k_results(results))
+        self.display_stats(results[0])
+        self.status_bar.showMessage("Solution found successfully!", 3000)
+
+    def display_stats(self, result):
+        """Show a result's stats and phase timings in the statistics panel"""
+        if self.stats_panel is not None:
+            self.stats_panel.show_stats(result.stats, result.timings)
+
+    def display_failure(self, error):
+        """Report an exception raised by run() the way solve() always has"""
+        if isinstance(error, SolveError):
+            self.display_error(str(error))
+        elif isinstance(error, grb.GurobiError):
+            self.display_error(f"Gurobi error: {error}")
+        else:
+            self.display_error(f"An error occurred: {error}")
 
     def display_error(self, message):
         """Display error message in status bar and show a message box"""
@@ -0,0 +1,89 @@
+import heapq
+from math import inf
+from .dijkstra import trace_path
+from .landmarks import distances_from
+
+
+def k_shortest_paths(csr, reverse, source, target, k, stats=None, worker=None):
+    """Up to k loopless source -> target paths, cheapest first, as (cost, path).
+
+    Yen's algorithm: every further path leaves an accepted one at some spur
+    node, with the edges that accepted paths already take from that root
+    banned. All spur searches share one Dijkstra tree into target (on the
+    reverse CSR): its distances are exact A* bounds, and banning nodes or
+    edges only makes real distances longer, so they stay admissible and a
+    spur search mostly walks straight down the tree. Weights must be
+    non-negative. stats gets the settled count over all searches; if the
+    worker is cancelled, the paths found so far are returned.
+    """
+    to_target = distances_from(reverse, target).tolist()
+    search = {}
+    first = _spur_path(csr, to_target, source, target, set(), set(), search)
+    settled = search['settled']
+    paths = [] if first is None else [first]
+    candidates = []  # (cost, path) heap of paths not yet accepted
+    seen = {tuple(path) for _, path in paths}
+
+    while paths and len(paths) < k:
+        _, previous = paths[-1]
+        root_cost = 0.0
+        for j, spur in enumerate(previous[:-1]):
+            if worker is not None and worker.cancelled:
+                break
+            root = previous[:j + 1]
+            banned_edges = {path[j + 1] for _, path in paths if path[:j + 1] == root}
+            banned_nodes = set(root[:-1])
+            spur_result = _spur_path(csr, to_target, spur, target, banned_nodes, banned_edges, search)
+            settled += search['settled']
+            if spur_result is not None:
+                spur_cost, spur_path = spur_result
+                path = root[:-1] + spur_path
+                if tuple(path) not in seen:
+                    seen.add(tuple(path))
+                    heapq.heappush(candidates, (root_cost + spur_cost, path))
+            root_cost += _edge_weight(csr, spur, previous[j + 1])
+        if not candidates or (worker is not None and worker.cancelled):
+            break
+        paths.append(heapq.heappop(candidates))
+
+    if stats is not None:
+        stats['settled'] = settled
+    return paths
+
+
+def _spur_path(csr, to_target, source, target, banned_nodes, banned_edges, stats):
+    """A* from source avoiding banned_nodes, and banned_edges (next nodes) out of source.
+
+    Returns (cost, path) or None; stats gets the settled count.
+    """
+    stats['settled'] = 0
+    if to_target[source] == inf:
+        return None
+    dist = {source: 0.0}
+    pred = {source: -1}
+    settled = set()
+    heap = [(to_target[source], 0.0, source)]
+    while heap:
+        _, d, u = heapq.heappop(heap)
+        if u in settled:
+            continue
+        settled.add(u)
+        if u == target:
+            break
+        for v, w in csr.neighbors(u):
+            if v in banned_nodes or (u == source and v in banned_edges) or to_target[v] == inf:
+                continue
+            nd = d + w
+            if nd < dist.get(v, inf):
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd + to_target[v], nd, v))
+    stats['settled'] = len(settled)
+    if target not in settled:
+        return None
+    return dist[target], trace_path(pred, target)
+
+
+def _edge_weight(csr, u, v):
+    # Edges are unique per (u, v), so the first match is the only one
+    return next(w for x, w in csr.neighbors(u) if x == v)
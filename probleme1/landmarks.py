@@ -0,0 +1,115 @@
+import heapq
+from math import inf
+import numpy as np
+from .dijkstra import astar, shortest_path
+
+# ALT preprocessing: exact distances from and to a few landmark nodes give
+# triangle-inequality lower bounds that steer A* towards the target.
+DEFAULT_LANDMARKS = 16
+# Finite stand-in for "unreachable" in the bound table; any bound at or
+# above half of it means the node cannot reach the target
+UNREACHABLE = 1e18
+
+
+def distances_from(csr, source):
+    """Plain one-to-all Dijkstra; returns an array of distances (inf if unreached)"""
+    n = csr.num_nodes
+    dist = [inf] * n
+    dist[source] = 0.0
+    done = bytearray(n)
+    heap = [(0.0, source)]
+    offsets, targets, weights = csr.offsets.tolist(), csr.targets, csr.weights
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = 1
+        lo, hi = offsets[u], offsets[u + 1]
+        for v, w in zip(targets[lo:hi].tolist(), weights[lo:hi].tolist()):
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return np.array(dist)
+
+
+class LandmarkIndex:
+    """Distances between every node and k landmarks, for ALT lower bounds.
+
+    forward[v, i] is the distance from landmark i to v and backward[v, i]
+    the distance from v to landmark i (node-major, so one node's bounds are
+    contiguous). version is the graph version the index was built for; any
+    edit, weights included, can break the bounds.
+    """
+
+    def __init__(self, landmarks, forward, backward, version):
+        self.landmarks = landmarks
+        self.forward = forward
+        self.backward = backward
+        self.version = version
+        # Both bound families as one row per node, with unreachable stored as
+        # UNREACHABLE instead of inf so no query ever computes inf - inf:
+        # bound = max(table[v] + query) over the 2k columns
+        self.table = np.hstack((-np.minimum(forward, UNREACHABLE), np.minimum(backward, UNREACHABLE)))
+
+    @classmethod
+    def build(cls, graph, k=DEFAULT_LANDMARKS, seed=0, worker=None):
+        """Pick k landmarks by farthest-point selection and record their distances.
+
+        Each new landmark is the node farthest (to and from) from the ones
+        already chosen, with unreached nodes counted as farthest so every
+        component gets covered. Returns None if the worker is cancelled.
+        Weights must be non-negative.
+        """
+        version = graph.version
+        n = graph.number_of_nodes()
+        csr, reverse = graph.csr(), graph.reverse_csr()
+        k = min(k, n)
+        landmarks = []
+        forward = np.empty((n, k))
+        backward = np.empty((n, k))
+        closeness = np.full(n, inf)  # Smallest round-trip distance to any landmark so far
+        node = int(np.random.default_rng(seed).integers(n)) if n else 0
+        for i in range(k):
+            if worker is not None and worker.cancelled:
+                return None
+            landmarks.append(node)
+            forward[:, i] = distances_from(csr, node)
+            backward[:, i] = distances_from(reverse, node)
+            closeness = np.minimum(closeness, forward[:, i] + backward[:, i])
+            closeness[landmarks] = -1
+            node = int(np.argmax(closeness))
+        return cls(landmarks, forward, backward, version)
+
+    def heuristic(self, target):
+        """Return h(nodes), lower bounds on the distance from each node to target.
+
+        For each landmark L: d(v, t) >= d(L, t) - d(L, v) and
+        d(v, t) >= d(v, L) - d(t, L). A landmark that reaches neither node
+        contributes 0; an infinite bound means v cannot reach target at all.
+        h takes a list of node ids so a whole neighbourhood is bounded in
+        one NumPy expression.
+        """
+        table = self.table
+        k = len(self.landmarks)
+        query = np.concatenate((-table[target, :k], -table[target, k:]))
+
+        def h(nodes):
+            bounds = (table[nodes] + query).max(axis=1).tolist()
+            return [inf if bound >= UNREACHABLE / 2 else max(bound, 0.0) for bound in bounds]
+        return h
+
+
+def compare_search_space(graph, index, queries=20, seed=0):
+    """Average settled nodes of plain Dijkstra and of ALT over random queries"""
+    n = graph.number_of_nodes()
+    csr = graph.csr()
+    rng = np.random.default_rng(seed)
+    plain = alt = 0
+    stats = {}
+    for source, target in rng.integers(n, size=(queries, 2)).tolist():
+        shortest_path(csr, source, target, stats)
+        plain += stats['settled']
+        astar(csr, source, target, index.heuristic(target), stats)
+        alt += stats['settled']
+    return plain / queries, alt / queries
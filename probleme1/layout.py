@@ -0,0 +1,163 @@
+import numpy as np
+from .graph_core import WEIGHT_CHANGED, CLEARED
+
+# Repulsion is exact while n * n stays within this many node pairs per
+# iteration (2000 nodes); larger graphs repel against a fresh random sample
+# of nodes each iteration, sized to the same budget and scaled up.
+REPULSION_PAIRS = 4_000_000
+MIN_REPULSION_SAMPLE = 100
+# Rows of the pairwise repulsion computed at once, to bound memory
+BLOCK_ROWS = 512
+# A seeded layout only nudges the previous positions: a low starting
+# temperature and fewer iterations keep the picture from jumping around
+INCREMENTAL_TEMPERATURE = 0.01
+INCREMENTAL_ITERATIONS = 20
+# Past this share of new nodes a fresh layout looks better than a seeded one
+INCREMENTAL_MAX_NEW = 0.2
+
+
+def spring_layout(n, src, dst, iterations=50, seed=0, pos=None, cancelled=None):
+    """Fruchterman-Reingold layout of n nodes joined by the src -> dst edges.
+
+    Edges attract both endpoints regardless of direction or weight (weights
+    are costs here, not spring strengths). Without pos the layout starts
+    from random positions in [-1, 1]; with pos it starts from there and
+    only refines it. Positions are left unscaled, so a refined layout keeps
+    the scale of the one it was seeded from.
+    cancelled() is polled while the layout runs; returns an (n, 2) array
+    indexed by node id, or None if cancelled.
+    """
+    rng = np.random.default_rng(seed)
+    if n < 2:
+        return np.zeros((n, 2)) if pos is None else pos.copy()
+    src, dst = src.astype(np.intp), dst.astype(np.intp)
+
+    k = 2 / np.sqrt(n)  # Ideal edge length for n nodes in a 2 x 2 box
+    if pos is None:
+        pos = rng.uniform(-1, 1, (n, 2))
+        temperature = 0.2
+    else:
+        pos = pos.copy()
+        temperature = INCREMENTAL_TEMPERATURE
+        iterations = INCREMENTAL_ITERATIONS
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        if cancelled is not None and cancelled():
+            return None
+        displacement = _repulsion(pos, k, rng, cancelled)
+        if displacement is None:
+            return None
+
+        delta = pos[src] - pos[dst]
+        distance = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 0.01)
+        pull = delta * (distance / k)[:, None]
+        np.subtract.at(displacement, src, pull)
+        np.add.at(displacement, dst, pull)
+
+        # Each node moves along its net force by at most the temperature
+        length = np.maximum(np.hypot(displacement[:, 0], displacement[:, 1]), 0.01)
+        pos += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+    return pos
+
+
+def _repulsion(pos, k, rng, cancelled=None):
+    n = len(pos)
+    others, scale = pos, 1.0
+    if n * n > REPULSION_PAIRS:
+        sample = max(MIN_REPULSION_SAMPLE, REPULSION_PAIRS // n)
+        others = pos[rng.choice(n, sample, replace=False)]
+        scale = n / sample
+    # sum_j (p_i - p_j) k^2 / d_ij^2 == p_i * sum_j f_ij - (f @ p)_i with f = k^2 / d^2,
+    # so each block is one matrix product instead of (rows, n, 2) temporaries
+    norms = (others ** 2).sum(axis=1)
+    displacement = np.empty_like(pos)
+    for lo in range(0, n, BLOCK_ROWS):
+        if cancelled is not None and cancelled():
+            return None
+        block = pos[lo:lo + BLOCK_ROWS]
+        distance2 = (block ** 2).sum(axis=1)[:, None] + norms[None, :] - 2 * block @ others.T
+        force = k * k / np.maximum(distance2, 1e-4)
+        displacement[lo:lo + BLOCK_ROWS] = block * force.sum(axis=1)[:, None] - force @ others
+    return displacement * scale
+
+
+class LayoutCache:
+    """Node positions of a graph, kept between views and reused as the next seed.
+
+    Subscribes to the graph: weight changes keep the layout, structural
+    edits make it stale but still usable as a seed, and CLEARED drops it.
+    structure counts structural edits, so a layout is current while its
+    version equals it; a layout from before the last CLEARED belongs to
+    another graph and is never stored.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.positions = None
+        self.version = None
+        self.structure = 0
+        self.cleared = 0  # structure right after the last CLEARED
+        graph.subscribe(self.on_graph_event)
+
+    def on_graph_event(self, event, index):
+        if event == WEIGHT_CHANGED:
+            return
+        self.structure += 1
+        if event == CLEARED:
+            self.positions = None
+            self.cleared = self.structure
+
+    def current(self):
+        """Positions for the graph as it is now, or None if a layout is needed"""
+        if self.positions is not None and self.version == self.structure:
+            return self.positions
+        return None
+
+    def store(self, positions, version):
+        """Keep positions laid out at version; returns False, keeping nothing,
+        if the graph was cleared or reloaded since"""
+        if version < self.cleared:
+            return False
+        self.positions = positions
+        self.version = version
+        return True
+
+    def task(self):
+        """Snapshot the graph and return task(worker) -> (version, positions).
+
+        The task only touches the snapshot, so it can run on a worker thread
+        while the graph keeps being edited.
+        """
+        n = self.graph.number_of_nodes()
+        src, dst, _ = (array.copy() for array in self.graph.edge_arrays())
+        seed = self.seed(n, src, dst)
+        version = self.structure
+
+        def task(worker=None):
+            cancelled = (lambda: worker.cancelled) if worker is not None else None
+            return version, spring_layout(n, src, dst, pos=seed, cancelled=cancelled)
+        return task
+
+    def seed(self, n, src, dst):
+        """Previous positions extended to new nodes, or None to lay out from scratch"""
+        if self.positions is None:
+            return None
+        known = len(self.positions)
+        if known > n or n - known > INCREMENTAL_MAX_NEW * n:
+            return None
+        pos = np.empty((n, 2))
+        pos[:known] = self.positions
+        # New nodes start at the mean of their already placed neighbours,
+        # or at a random spot if they have none
+        rng = np.random.default_rng(known)
+        pos[known:] = rng.uniform(-1, 1, (n - known, 2))
+        total = np.zeros((n, 2))
+        count = np.zeros(n)
+        for new, old in ((src, dst), (dst, src)):
+            mask = (new >= known) & (old < known)
+            np.add.at(total, new[mask], pos[old[mask]])
+            np.add.at(count, new[mask], 1)
+        placed = np.flatnonzero(count)
+        pos[placed] = total[placed] / count[placed][:, None] + rng.normal(0, 0.02, (len(placed), 2))
+        return pos
@@ -1,48 +1,24 @@
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QLabel, QLineEdit, QPushButton, QComboBox, QTextEdit, 
-                            QTableWidget, QTableWidgetItem, QHeaderView, QFrame, 
-                            QMessageBox, QFileDialog, QSizePolicy, QDialog)
+                            QTableView, QHeaderView, QFrame, 
+                            QMessageBox, QFileDialog, QSizePolicy, QDialog, QSpinBox)
 from PyQt5.QtCore import Qt, QSize
 from PyQt5.QtGui import QFont, QColor, QPalette, QIcon
-import networkx as nx
 import sys
-import re, csv
-from .gurobi_solver import GurobiSolver
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-
-class GraphViewDialog(QDialog):
-    def __init__(self, graph, colors=None, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Graph View")
-        self.resize(600, 500)
-        self.graph = graph
-        self.colors = colors or {
-            "primary": "#4a6da7",
-            "secondary": "#6c5ce7",
-            "success": "#00b894",
-            "danger": "#d63031",
-            "warning": "#fdcb6e",
-            "dark": "#2d3436",
-            "light": "#dfe6e9",
-            "background": "#1e1e2e",
-            "card": "#2a2a3a",
-            "text": "#ffffff"
-        }
-        layout = QVBoxLayout(self)
-        self.figure, self.ax = plt.subplots()
-        self.canvas = FigureCanvas(self.figure)
-        layout.addWidget(self.canvas)
-        self.draw_graph()
-
-    def draw_graph(self):
-        self.ax.clear()
-        self.ax.set_facecolor(self.colors['background'])  # Set background color
-        pos = nx.spring_layout(self.graph)
-        nx.draw(self.graph, pos, ax=self.ax, with_labels=True, node_color=self.colors['primary'], edge_color=self.colors['secondary'], font_color=self.colors['text'])
-        edge_labels = nx.get_edge_attributes(self.graph, 'weight')
-        nx.draw_networkx_edge_labels(self.graph, pos, edge_labels=edge_labels, ax=self.ax, font_color=self.colors['warning'])
-        self.canvas.draw()
+import re, csv, math
+from solve_worker import SolveWorker  # Shared with probleme2, next to home.py
+from stats_panel import StatsPanel
+from .graph_core import Graph
+from .graph_models import NodeTableModel, EdgeTableModel, AdjacencyMatrixModel
+from .graph_io import (BINARY_SUFFIX, load_graph_file, save_binary, save_layout, load_layout,
+                       save_hierarchy, load_hierarchy)
+from .gurobi_solver import ENGINES, GurobiSolver
+from .path_solver import SolveError
+from .all_pairs import MAX_NODES, AllPairsIndex
+from .result_cache import open_cache
+from .graph_view import GraphViewDialog
+from .tree_view import TreeDialog
+from .layout import LayoutCache
 
 class GraphEditor(QMainWindow):
     def __init__(self, home_window=None):
@@ -68,13 +44,24 @@ class GraphEditor(QMainWindow):
         # Set dark theme
         self.set_dark_theme()
         
-        self.graph = nx.DiGraph()
+        self.graph = Graph()
+        self.graph.subscribe(self.on_graph_event)
+        self.layout_cache = LayoutCache(self.graph)
+        self.layout_worker = None  # SolveWorker computing a layout in the background
+        self.layout_ready = False  # Its layout came in: show the view once it has finished
+        self.graph_path = None     # File the graph was last loaded from or saved to
+        self.saved_version = None  # graph.version at that load/save
         self.start_node = None
         self.end_node = None
+        self.all_pairs = None  # Opt-in AllPairsIndex, dropped on every graph edit
+        self.worker = None     # SolveWorker running the current solve, if any
+        self.last_path = None  # Last solved path, highlighted in the graph view
         # self.init_return_button()
         
         self.init_ui()
-        self.solver = GurobiSolver(self.graph, self.statusBar(), self.result_text, None, None)
+        # Answers persist across sessions, keyed by graph content; None if the file is unusable
+        self.solver = GurobiSolver(self.graph, self.statusBar(), self.result_text, None, None,
+                                   stats_panel=self.stats_panel, cache=open_cache())
     
     def return_to_home(self):
         """Return to home screen"""
@@ -116,6 +103,7 @@ class GraphEditor(QMainWindow):
         sidebar.setMinimumWidth(300)
         sidebar.setMaximumWidth(350)
         sidebar.setStyleSheet(f"background-color: {self.colors['card']}; border-radius: 10px;")
+        self.sidebar = sidebar
         sidebar_layout = QVBoxLayout(sidebar)
         sidebar_layout.setContentsMargins(15, 15, 15, 15)
         sidebar_layout.setSpacing(15)
@@ -142,8 +130,8 @@ class GraphEditor(QMainWindow):
                                         action=self.open_matrix_input, tooltip="Define relations using a matrix")
         edge_content.layout.addWidget(matrix_btn)
 
-        show_graph_btn = self.create_button("Show Graph", self.colors["secondary"], icon="🖼️", action=self.show_graph_view, tooltip="Visualize the current graph")
-        edge_content.layout.addWidget(show_graph_btn)
+        self.show_graph_btn = self.create_button("Show Graph", self.colors["secondary"], icon="🖼️", action=self.show_graph_view, tooltip="Visualize the current graph")
+        edge_content.layout.addWidget(self.show_graph_btn)
 
         csv_group, csv_content = self.create_card("CSV OPERATIONS")
         add_csv_btn = self.create_button("Load CSV", self.colors["primary"], icon="📂", 
@@ -173,13 +161,15 @@ class GraphEditor(QMainWindow):
         
         # Nodes table
         nodes_card, nodes_content = self.create_card("NODES")
-        self.nodes_table = self.create_table(["Node"])
+        self.nodes_model = NodeTableModel(self.graph, self)
+        self.nodes_table = self.create_table(self.nodes_model)
         nodes_content.layout.addWidget(self.nodes_table)
 
         
         # Edges table
         edges_card, edges_content = self.create_card("EDGES")
-        self.edges_table = self.create_table(["From", "To", "Weight"])
+        self.edges_model = EdgeTableModel(self.graph, self)
+        self.edges_table = self.create_table(self.edges_model)
         edges_content.layout.addWidget(self.edges_table)
 
         tables_layout.addWidget(nodes_card)
@@ -193,17 +183,78 @@ class GraphEditor(QMainWindow):
         self.start_node_combobox = QComboBox()
         self.start_node_combobox.setPlaceholderText("Start node")
         self.start_node_combobox.setStyleSheet(self.get_combo_style())
+        # Both combos share the nodes table model, so they follow graph edits;
+        # a fixed width hint keeps them from measuring every node name
+        self.start_node_combobox.setModel(self.nodes_model)
+        self.start_node_combobox.view().setUniformItemSizes(True)
+        self.start_node_combobox.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.start_node_combobox.setMinimumContentsLength(12)
 
         self.end_node_combobox = QComboBox()
         self.end_node_combobox.setPlaceholderText("End node")
         self.end_node_combobox.setStyleSheet(self.get_combo_style())
+        self.end_node_combobox.setModel(self.nodes_model)
+        self.end_node_combobox.view().setUniformItemSizes(True)
+        self.end_node_combobox.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.end_node_combobox.setMinimumContentsLength(12)
 
-        solve_btn = self.create_button("Solve", self.colors["secondary"], icon="🚀", 
+        self.solve_btn = self.create_button("Solve", self.colors["secondary"], icon="🚀", 
                                     action=self.solve_graph, tooltip="Find shortest path")
+        self.tree_btn = self.create_button("Solve to All", self.colors["secondary"], icon="🌳",
+                                    action=self.solve_tree, tooltip="Shortest paths from the start node to every node")
+        self.cancel_btn = self.create_button("Cancel", self.colors["danger"], icon="✖",
+                                    action=self.cancel_solve, tooltip="Stop the running solve")
+        self.cancel_btn.setEnabled(False)
 
         path_layout.addWidget(self.start_node_combobox)
         path_layout.addWidget(self.end_node_combobox)
-        path_layout.addWidget(solve_btn)
+        self.precompute_btn = self.create_button("Precompute All Pairs", self.colors["primary"], icon="⚡",
+                                    action=self.precompute_all_pairs,
+                                    tooltip="Answer every later query from a precomputed index")
+        self.landmarks_btn = self.create_button("Precompute Landmarks", self.colors["primary"], icon="📍",
+                                    action=self.precompute_landmarks,
+                                    tooltip="Speed up later queries with A* and landmark lower bounds (ALT)")
+        self.hierarchy_btn = self.create_button("Precompute Hierarchy", self.colors["primary"], icon="🛣",
+                                    action=self.precompute_hierarchy,
+                                    tooltip="Contract the graph for near-instant queries on large road networks (CH)")
+
+        # "Auto" lets the solver pick per graph; any other entry forces that engine
+        self.engine_combobox = QComboBox()
+        self.engine_combobox.setStyleSheet(self.get_combo_style())
+        self.engine_combobox.setToolTip("Shortest-path engine (Auto picks the fastest exact one)")
+        self.engine_combobox.addItem("Auto engine", "auto")
+        for name, engine in ENGINES.items():
+            self.engine_combobox.addItem(engine.label, name)
+        self.engine_combobox.currentIndexChanged.connect(
+            lambda: setattr(self.solver, 'engine', self.engine_combobox.currentData()))
+
+        # More than one path lists the k cheapest loopless alternatives (Yen)
+        self.k_spinbox = QSpinBox()
+        self.k_spinbox.setRange(1, 100)
+        self.k_spinbox.setPrefix("k = ")
+        self.k_spinbox.setToolTip("Number of alternative paths to list")
+        self.k_spinbox.setStyleSheet(f"""
+            QSpinBox {{
+                background-color: {self.colors['dark']};
+                color: {self.colors['text']};
+                border: 1px solid {self.colors['dark']};
+                border-radius: 5px;
+                padding: 8px;
+            }}
+        """)
+
+        path_layout.addWidget(self.k_spinbox)
+        path_layout.addWidget(self.solve_btn)
+        path_layout.addWidget(self.tree_btn)
+        path_layout.addWidget(self.cancel_btn)
+
+        # Precomputation gets its own row so the query controls keep their width
+        precompute_layout = QHBoxLayout()
+        path_content.layout.addLayout(precompute_layout)
+        precompute_layout.addWidget(self.engine_combobox)
+        precompute_layout.addWidget(self.precompute_btn)
+        precompute_layout.addWidget(self.landmarks_btn)
+        precompute_layout.addWidget(self.hierarchy_btn)
         
         # Results area
         result_card, result_content = self.create_card("RESULTS")
@@ -220,6 +271,8 @@ class GraphEditor(QMainWindow):
             }}
         """)
         result_content.layout.addWidget(self.result_text)
+        self.stats_panel = StatsPanel()
+        result_content.layout.addWidget(self.stats_panel)
         
         # Add widgets to content area
         content_layout.addWidget(tables_widget)
@@ -327,16 +380,17 @@ class GraphEditor(QMainWindow):
             btn.setToolTip(tooltip)
             
         return btn 
-    def create_table(self, headers):
-        table = QTableWidget()
-        table.setColumnCount(len(headers))
-        table.setHorizontalHeaderLabels(headers)
+    def create_table(self, model):
+        table = QTableView()
+        table.setModel(model)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Fixed row heights so the view never measures rows it does not paint
+        table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         table.verticalHeader().setVisible(False)
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
-        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.setEditTriggers(QTableView.NoEditTriggers)
+        table.setSelectionBehavior(QTableView.SelectRows)
         table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {self.colors['card']};
                 color: {self.colors['text']};
                 border: 1px solid {self.colors['dark']};
@@ -397,7 +451,7 @@ class GraphEditor(QMainWindow):
 
     def validate_edge_weight(self, weight):
         try:
-            return float(weight) >= 0
+            return math.isfinite(float(weight))  # Negative weights (rebates) are fine
         except ValueError:
             return False
 
@@ -406,7 +460,6 @@ class GraphEditor(QMainWindow):
         if self.validate_node_name(node_name):
             if node_name not in self.graph:
                 self.graph.add_node(node_name)
-                self.update_node_list()
                 self.node_name_entry.clear()
                 self.show_status("Node added successfully", False)
             else:
@@ -422,39 +475,21 @@ class GraphEditor(QMainWindow):
             if len(nodes) == 2 and nodes[0] in self.graph and nodes[1] in self.graph:
                 if self.validate_edge_weight(weight_input):
                     weight = float(weight_input)
-                    self.graph.add_edge(nodes[0], nodes[1], weight=weight)
-                    self.update_edge_list()
+                    self.graph.add_edge(nodes[0], nodes[1], weight)
                     self.edge_nodes_entry.clear()
                     self.edge_weight_entry.clear()
                     self.show_status("Edge added successfully", False)
                 else:
-                    self.show_status("Weight must be a positive number")
+                    self.show_status("Weight must be a number")
             else:
                 self.show_status("Both nodes must exist in the graph")
         else:
             self.show_status("Please fill all fields")
 
-    def update_node_list(self):
-        self.nodes_table.setRowCount(0)
-        for node in self.graph.nodes:
-            row = self.nodes_table.rowCount()
-            self.nodes_table.insertRow(row)
-            self.nodes_table.setItem(row, 0, QTableWidgetItem(node))
-        
-        nodes = list(self.graph.nodes)
-        self.start_node_combobox.clear()
-        self.end_node_combobox.clear()
-        self.start_node_combobox.addItems(nodes)
-        self.end_node_combobox.addItems(nodes)
-
-    def update_edge_list(self):
-        self.edges_table.setRowCount(0)
-        for u, v, d in self.graph.edges(data=True):
-            row = self.edges_table.rowCount()
-            self.edges_table.insertRow(row)
-            self.edges_table.setItem(row, 0, QTableWidgetItem(u))
-            self.edges_table.setItem(row, 1, QTableWidgetItem(v))
-            self.edges_table.setItem(row, 2, QTableWidgetItem(str(d["weight"])))
+    def on_graph_event(self, event, index):
+        """Graph listener; tables, combos and the solver model follow edits on their own"""
+        self.all_pairs = None
+        self.last_path = None
 
     def show_status(self, message, is_error=True):
         self.statusBar().showMessage(message)
@@ -471,63 +506,199 @@ class GraphEditor(QMainWindow):
             self.end_node = end
             self.solver.start_node = start
             self.solver.end_node = end
-            self.solver.solve()
+            k = self.k_spinbox.value()
+            if k > 1:
+                self.start_solve_worker(lambda worker: self.solver.run_k(k, worker), self.on_k_paths_succeeded)
+            elif self.all_pairs is not None:
+                _, path = self.all_pairs.path(start, end)
+                if path is None:
+                    self.solver.display_error("No optimal solution found.")
+                else:
+                    self.last_path = path
+                    self.solver.display_path(path)
+            else:
+                self.start_solve_worker()
         else:
             self.show_status("Please select valid start and end nodes")
 
+    def solve_tree(self):
+        start = self.start_node_combobox.currentText()
+        if start in self.graph:
+            self.start_solve_worker(lambda worker: self.solver.find_tree(start, worker), self.on_tree_succeeded)
+        else:
+            self.show_status("Please select a valid start node")
+
+    def start_solve_worker(self, task=None, on_succeeded=None):
+        """Run the solver on a worker thread; the graph is locked until it finishes"""
+        self.worker = SolveWorker(task or self.solver.run, self)
+        self.worker.tick.connect(lambda elapsed: self.statusBar().showMessage(f"Solving... {elapsed:.1f} s"))
+        self.worker.succeeded.connect(on_succeeded or self.on_solve_succeeded)
+        self.worker.failed.connect(self.on_solve_failed)
+        self.worker.finished.connect(self.on_solve_finished)
+        self.set_solving(True)
+        self.worker.start()
+
+    def set_solving(self, solving):
+        self.sidebar.setEnabled(not solving)
+        self.solve_btn.setEnabled(not solving)
+        self.tree_btn.setEnabled(not solving)
+        self.precompute_btn.setEnabled(not solving)
+        self.landmarks_btn.setEnabled(not solving)
+        self.hierarchy_btn.setEnabled(not solving)
+        self.k_spinbox.setEnabled(not solving)
+        self.engine_combobox.setEnabled(not solving)
+        self.start_node_combobox.setEnabled(not solving)
+        self.end_node_combobox.setEnabled(not solving)
+        self.cancel_btn.setEnabled(solving)
+
+    def cancel_solve(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.statusBar().showMessage("Cancelling...")
+
+    def on_solve_succeeded(self, result):
+        self.last_path = result.path
+        self.solver.display_result(result)
+        details = f"{self.worker.elapsed():.2f} s, {result.stats['engine']}"
+        if result.stats.get('cache') == "hit":
+            details += ", from cache"
+        if 'settled' in result.stats:
+            details += f", {result.stats['settled']} nodes settled"
+        self.statusBar().showMessage(f"{self.solver.status_message(result)} ({details})", 3000)
+
+    def on_k_paths_succeeded(self, results):
+        self.last_path = results[0].path
+        self.solver.display_results(results)
+        self.statusBar().showMessage(f"{len(results)} path(s) found ({self.worker.elapsed():.2f} s, "
+                                     f"{results[0].stats['settled']} nodes settled)", 3000)
+
+    def on_tree_succeeded(self, tree):
+        self.solver.display_stats(tree)
+        self.statusBar().showMessage(f"{tree.reached} of {self.graph.number_of_nodes()} nodes reached "
+                                     f"({self.worker.elapsed():.2f} s, {tree.stats['engine']})", 3000)
+        dialog = TreeDialog(self.graph.names, tree, colors=self.colors, parent=self)
+        dialog.exec_()
+        dialog.deleteLater()
+
+    def on_solve_failed(self, error):
+        if self.worker.cancelled:
+            self.show_status("Solve cancelled.")
+        else:
+            self.solver.display_failure(error)
+
+    def on_solve_finished(self):
+        self.set_solving(False)
+        self.worker.deleteLater()
+        self.worker = None
+
+    def closeEvent(self, event):
+        # Never leave a solve thread running behind a closed window
+        for worker in (self.worker, self.layout_worker):
+            if worker is not None:
+                worker.cancel()
+                worker.wait()
+        super().closeEvent(event)
+
+    def precompute_all_pairs(self):
+        if not self.graph.nodes:
+            self.show_status("The graph is empty. Nothing to precompute.")
+            return
+        if self.graph.number_of_nodes() > MAX_NODES:
+            self.show_status(f"All-pairs index is limited to {MAX_NODES} nodes "
+                             f"(graph has {self.graph.number_of_nodes()}).")
+            return
+
+        def build(worker):
+            index = AllPairsIndex.build(self.graph, worker=worker)
+            if index is None:
+                raise SolveError("Solve cancelled.")
+            return index
+        self.start_solve_worker(build, self.on_all_pairs_ready)
+
+    def on_all_pairs_ready(self, index):
+        self.all_pairs = index
+        self.show_status(f"All-pairs index built for {len(index.nodes)} nodes "
+                         f"({self.worker.elapsed():.2f} s)", False)
+
+    def precompute_landmarks(self):
+        self.start_solve_worker(self.solver.precompute_landmarks, self.on_landmarks_ready)
+
+    def on_landmarks_ready(self, settled):
+        plain, alt = settled
+        self.show_status(f"Landmarks ready: ALT settles {alt:.0f} nodes per query on average, "
+                         f"Dijkstra {plain:.0f}", False)
+
+    def precompute_hierarchy(self):
+        self.start_solve_worker(self.solver.precompute_hierarchy, self.on_hierarchy_ready)
+
+    def on_hierarchy_ready(self, hierarchy):
+        self.show_status(f"Hierarchy ready: {hierarchy.num_shortcuts} shortcuts "
+                         f"for {self.graph.number_of_nodes()} nodes", False)
+        self.persist_hierarchy()
+
     def load_graph(self):
-        path, _ = QFileDialog.getOpenFileName(self, "Open Graph", "", "CSV Files (*.csv)")
+        path, _ = QFileDialog.getOpenFileName(self, "Open Graph", "", "Graph Files (*.csv *.npgraph)")
         if path:
             try:
-                with open(path) as f:
-                    # Debug: Print raw content
-                    content = f.read()
-                    print(f"File content:\n{content}")
-                    f.seek(0)
-                    
-                    # Process file
-                    reader = csv.reader(f)
-                    self.graph.clear()  # Clear existing graph
-                    
-                    for row in reader:
-                        if not row:  # Skip empty lines
-                            continue
-                        if len(row) == 1: 
-                            self.graph.add_node(row[0].strip())
-                        elif len(row) == 3: 
-                            try:
-                                weight = float(row[2])
-                                self.graph.add_edge(row[0].strip(), row[1].strip(), weight=weight)
-                            except ValueError:
-                                print(f"Skipping invalid edge weight: {row[2]}")
-                
-                # Debug: Verify graph state
-                print("Final nodes:", self.graph.nodes())
-                print("Final edges:", self.graph.edges(data=True))
-                
-                # Update UI
-                self.update_node_list()
-                self.update_edge_list()
-                
-                # Force refresh
-                self.nodes_table.resizeColumnsToContents()
-                self.edges_table.resizeColumnsToContents()
-                
-                self.show_status("Graph loaded successfully", False)
+                # Load straight into the existing graph (CSVs reuse their binary cache)
+                _, report = load_graph_file(path, self.graph)
+                self.remember_graph_path(path)
+                positions = load_layout(path, self.graph)
+                if positions is not None:
+                    self.layout_cache.store(positions, self.layout_cache.structure)
+                self.solver.hierarchy = load_hierarchy(path, self.graph)
+
+                if report.errors:
+                    self.show_status(f"Graph loaded, {len(report.errors)} invalid row(s) skipped")
+                    QMessageBox.warning(self, "Invalid rows", report.summary())
+                else:
+                    self.show_status("Graph loaded successfully", False)
                 
             except Exception as e:
                 self.show_status(f"Error loading file: {str(e)}")
-                print(f"Error: {e}")       
     def save_graph(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Save Graph", "", "CSV Files (*.csv)")
-        if path:
+        path, _ = QFileDialog.getSaveFileName(self, "Save Graph", "", "CSV Files (*.csv);;Binary Graph (*.npgraph)")
+        if path.endswith(BINARY_SUFFIX):
+            save_binary(self.graph, path)
+            self.show_status("Graph saved successfully", False)
+        elif path:
             with open(path, 'w', newline='') as f:
                 writer = csv.writer(f)
                 for n in self.graph.nodes: 
                     writer.writerow([n])
-                for u, v, d in self.graph.edges(data=True): 
-                    writer.writerow([u, v, d['weight']])
+                for u, v, w in self.graph.edges(): 
+                    writer.writerow([u, v, w])
             self.show_status("Graph saved successfully", False)
+        if path:
+            self.remember_graph_path(path)
+            self.persist_layout()
+            self.persist_hierarchy()
+
+    def remember_graph_path(self, path):
+        self.graph_path = path
+        self.saved_version = self.graph.version
+
+    def persist_layout(self):
+        """Write the current layout next to the graph file, if the file still matches the graph"""
+        positions = self.layout_cache.current()
+        # The file stores the content hash, so any edit since the load/save (even a weight) rules it out
+        if positions is None or self.graph_path is None or self.saved_version != self.graph.version:
+            return
+        try:
+            save_layout(self.graph_path, self.graph, positions)
+        except OSError:
+            pass  # The layout is only a cache
+
+    def persist_hierarchy(self):
+        """Write the current hierarchy next to the graph file, if the file still matches the graph"""
+        hierarchy = self.solver.hierarchy
+        if (hierarchy is None or hierarchy.version != self.graph.version
+                or self.graph_path is None or self.saved_version != self.graph.version):
+            return
+        try:
+            save_hierarchy(self.graph_path, hierarchy)
+        except OSError:
+            pass  # Like the layout, the hierarchy can always be rebuilt
     def open_matrix_input(self):
         nodes = list(self.graph.nodes)
         if not nodes:
@@ -536,25 +707,53 @@ class GraphEditor(QMainWindow):
     
         dialog = MatrixInputDialog(nodes, self, colors=self.colors, graph=self.graph)
         if dialog.exec_() == QDialog.Accepted:
-            matrix = dialog.get_matrix()
-            self.graph.remove_edges_from(list(self.graph.edges))  # Clear previous edges
-            for (u, v), w in matrix.items():
-                self.graph.add_edge(u, v, weight=w)
-    
-            self.refresh_edges_table()
+            # Only edited cells touch the graph; each emits its own change event
+            for (u, v), w in dialog.get_changes().items():
+                if w is None:
+                    self.graph.remove_edge(u, v)
+                else:
+                    self.graph.add_edge(u, v, w)
             self.statusBar().showMessage("Edges updated via matrix.", 5000)
-    def refresh_edges_table(self):
-        self.edges_table.setRowCount(0)
-        for u, v, data in self.graph.edges(data=True):
-            row_pos = self.edges_table.rowCount()
-            self.edges_table.insertRow(row_pos)
-            self.edges_table.setItem(row_pos, 0, QTableWidgetItem(str(u)))
-            self.edges_table.setItem(row_pos, 1, QTableWidgetItem(str(v)))
-            self.edges_table.setItem(row_pos, 2, QTableWidgetItem(str(data.get("weight", ""))))
 
     def show_graph_view(self):
-        dialog = GraphViewDialog(self.graph, colors=self.colors, parent=self)
+        positions = self.layout_cache.current()
+        if positions is None:
+            # Lay the graph out in the background, then come back here
+            self.start_layout_worker()
+            return
+        dialog = GraphViewDialog(self.graph, colors=self.colors, parent=self, path=self.last_path,
+                                 positions=positions)
         dialog.exec_()
+        dialog.deleteLater()  # Otherwise every closed view stays parented to the editor
+
+    def start_layout_worker(self):
+        self.show_graph_btn.setEnabled(False)
+        self.layout_worker = SolveWorker(self.layout_cache.task(), self)
+        self.layout_worker.tick.connect(
+            lambda elapsed: self.statusBar().showMessage(f"Computing layout... {elapsed:.1f} s"))
+        self.layout_worker.succeeded.connect(self.on_layout_succeeded)
+        self.layout_worker.failed.connect(lambda e: self.show_status(f"Layout failed: {e}"))
+        self.layout_worker.finished.connect(self.on_layout_finished)
+        self.layout_worker.start()
+
+    def on_layout_succeeded(self, result):
+        version, positions = result
+        if positions is None:  # Cancelled
+            return
+        if self.layout_cache.store(positions, version):
+            self.persist_layout()
+        self.statusBar().clearMessage()
+        self.layout_ready = True
+
+    def on_layout_finished(self):
+        self.layout_worker.deleteLater()
+        self.layout_worker = None
+        self.show_graph_btn.setEnabled(True)
+        if self.layout_ready:
+            self.layout_ready = False
+            # If the graph was edited meanwhile this starts a quick seeded
+            # pass, and if another graph was loaded, a fresh layout
+            self.show_graph_view()
 
 class MatrixInputDialog(QDialog):
     def __init__(self, nodes, parent=None, colors=None, graph=None):
@@ -578,9 +777,12 @@ class MatrixInputDialog(QDialog):
 
         layout = QVBoxLayout(self)
 
-        self.table = QTableWidget(len(nodes), len(nodes))
-        self.table.setHorizontalHeaderLabels(nodes)
-        self.table.setVerticalHeaderLabels(nodes)
+        # Cells are only materialised for the part of the matrix in view
+        self.model = AdjacencyMatrixModel(nodes, graph, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        for header in (self.table.horizontalHeader(), self.table.verticalHeader()):
+            header.setSectionResizeMode(QHeaderView.Fixed)
         layout.addWidget(self.table)
 
         # Apply custom dark style to the dialog and table
@@ -588,7 +790,7 @@ class MatrixInputDialog(QDialog):
             QDialog {{
                 background-color: {self.colors['background']};
             }}
-            QTableWidget {{
+            QTableView {{
                 background-color: {self.colors['card']};
                 color: {self.colors['text']};
                 border: 1px solid {self.colors['dark']};
@@ -618,19 +820,6 @@ class MatrixInputDialog(QDialog):
             }}
         """)
 
-        # Initialize all cells to '0' to avoid empty cell warnings
-        for i in range(len(nodes)):
-            for j in range(len(nodes)):
-                self.table.setItem(i, j, QTableWidgetItem("0"))
-
-        # Pre-fill with current graph weights if provided
-        if self.graph is not None:
-            for u, v, data in self.graph.edges(data=True):
-                if u in self.nodes and v in self.nodes:
-                    i = self.nodes.index(u)
-                    j = self.nodes.index(v)
-                    self.table.setItem(i, j, QTableWidgetItem(str(data.get("weight", "0"))))
-
         button_layout = QHBoxLayout()
         apply_btn = QPushButton("Apply")
         apply_btn.clicked.connect(self.accept)
@@ -642,19 +831,9 @@ class MatrixInputDialog(QDialog):
 
         layout.addLayout(button_layout)
 
-    def get_matrix(self):
-        matrix = {}
-        for i, from_node in enumerate(self.nodes):
-            for j, to_node in enumerate(self.nodes):
-                item = self.table.item(i, j)
-                if item:
-                    try:
-                        weight = float(item.text())
-                        if weight != 0:
-                            matrix[(from_node, to_node)] = weight
-                    except ValueError:
-                        continue
-        return matrix
+    def get_changes(self):
+        """Edited edges only: {(u, v): new weight, or None if the edge was cleared}"""
+        return self.model.changes()
 
 
 
@@ -0,0 +1,111 @@
+import numpy as np
+from .bellman_ford import NegativeCycleError
+from .dijkstra import trace_path
+
+# Network simplex specialised to shortest paths: the basis is a spanning
+# tree of the nodes reachable from the source, the dual values are the tree
+# distances, and a pivot re-hangs the subtree under v from the arc (u, v)
+# whose reduced cost dist[u] + w - dist[v] is negative, shifting the whole
+# subtree's distances by that amount. At optimality no arc has a negative
+# reduced cost, so the tree is a shortest-path tree. Unlike Dijkstra this
+# handles negative weights; an entering arc whose head is an ancestor of its
+# tail closes a negative cycle, which is reported instead.
+
+# Reduced costs above -TOLERANCE count as non-negative, so float round-off
+# cannot make the pivots cycle
+TOLERANCE = 1e-9
+
+
+def shortest_path_tree(csr, source, stats=None, worker=None):
+    """Shortest-path tree from source by network simplex pivots.
+
+    Returns (dist, pred) arrays over all node ids: dist is inf and pred -1
+    for nodes source cannot reach, and pred is -1 for the source itself.
+    Each round prices every arc at once with NumPy, then pivots the
+    eligible arcs most negative first, re-checking each against the
+    distances the earlier pivots left. stats gets the pivot count. Raises
+    NegativeCycleError; returns (None, None) if worker is cancelled.
+    """
+    n = csr.num_nodes
+    tails = np.repeat(np.arange(n), np.diff(csr.offsets))
+    heads = csr.targets
+    weights = csr.weights
+    dist = np.full(n, np.inf)
+    dist[source] = 0.0
+    pred = np.full(n, -1, dtype=np.int64)
+    children = {}  # Tree children of each node that has some
+    pivots = 0
+
+    while True:
+        if worker is not None and worker.cancelled:
+            return None, None
+        # Arcs into unreached nodes price at -inf; arcs out of them at nan
+        with np.errstate(invalid='ignore'):
+            reduced = dist[tails] + weights - dist[heads]
+        eligible = np.flatnonzero(reduced < -TOLERANCE)
+        if not eligible.size:
+            break
+        eligible = eligible[np.argsort(reduced[eligible], kind='stable')]
+        for u, v, w in zip(tails[eligible].tolist(), heads[eligible].tolist(), weights[eligible].tolist()):
+            delta = dist[u] + w - dist[v]
+            if not delta < -TOLERANCE:
+                continue  # An earlier pivot in this round already fixed it
+            subtree = _subtree(children, v)
+            if u in subtree:
+                raise NegativeCycleError(_cycle(pred, u, v))
+            if np.isinf(delta):
+                dist[v] = dist[u] + w
+            else:
+                dist[subtree] += delta
+            parent = pred[v]
+            if parent != -1:
+                children[parent].discard(v)
+            pred[v] = u
+            children.setdefault(u, set()).add(v)
+            pivots += 1
+
+    if stats is not None:
+        stats['pivots'] = pivots
+    return dist, pred
+
+
+def tree_path(dist, pred, target):
+    """(cost, path) to target on a shortest_path_tree(), or (None, None)"""
+    if np.isinf(dist[target]):
+        return None, None
+    return float(dist[target]), [int(node) for node in trace_path(pred, target)]
+
+
+def tree_hops(pred):
+    """Edges from the root to every node of a predecessor array (0 for the
+    root and for unreached nodes, which both have pred -1), by pointer
+    jumping: each round adds the hop count of a node's current ancestor and
+    jumps to that ancestor's, so the deepest chain takes log2(depth)
+    vectorised rounds"""
+    nodes = np.arange(len(pred))
+    up = np.where(pred < 0, nodes, pred)  # Roots point at themselves
+    hops = (pred >= 0).astype(np.int64)
+    while True:
+        moving = up[up] != up
+        if not moving.any():
+            break
+        hops[moving] += hops[up[moving]]
+        up[moving] = up[up[moving]]
+    return hops
+
+
+def _subtree(children, root):
+    """Node ids of the tree hanging from root, root first"""
+    nodes = [root]
+    for node in nodes:
+        nodes.extend(children.get(node, ()))
+    return nodes
+
+
+def _cycle(pred, u, v):
+    """The cycle closed by arc (u, v) when v is an ancestor of u in the tree"""
+    cycle = [u]
+    while cycle[-1] != v:
+        cycle.append(int(pred[cycle[-1]]))
+    cycle.reverse()
+    return cycle + [v]
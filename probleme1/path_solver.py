@@ -0,0 +1,620 @@
+import time
+from contextlib import contextmanager
+import gurobipy as grb
+import numpy as np
+from solve_stats import model_stats  # Shared with probleme2, next to home.py
+from .bellman_ford import JohnsonIndex, NegativeCycleError, bellman_ford_path, spfa
+from .contraction import ContractionHierarchy
+from .dijkstra import shortest_path, bidirectional_dijkstra, astar
+from .dynamic_tree import DynamicTree
+from .graph_core import WEIGHT_CHANGED, CLEARED
+from .k_shortest import k_shortest_paths
+from .landmarks import LandmarkIndex, compare_search_space
+from .network_simplex import shortest_path_tree, tree_hops, tree_path
+
+# Qt-free solver core: everything here returns plain data and never touches
+# a widget, so it can be scripted, batched or benchmarked without a
+# QApplication. gurobi_solver.GurobiSolver adapts it to the GUI.
+
+# Registered engines by name, in menu order (filled at the bottom of this
+# module); ShortestPathSolver.engine is one of these names or "auto", see
+# select_engine(). "lp" solves the MIP's LP relaxation, which is exact
+# here: the node-arc matrix is totally unimodular, so the optimal vertex
+# is integral.
+ENGINES = {}
+# Engines that solve the node-arc model with Gurobi
+MODEL_ENGINES = ("mip", "lp")
+# With negative weights, "auto" answers the first queries on a graph with
+# SPFA and switches to Johnson reweighting from this many queries on: the
+# potentials cost about one SPFA pass and make every later query a Dijkstra
+JOHNSON_AFTER_QUERIES = 2
+
+# PathResult statuses
+OPTIMAL = "optimal"
+NO_PATH = "no_path"
+NEGATIVE_CYCLE = "negative_cycle"  # path is the cycle, objective its (negative) weight
+
+
+class SolveError(Exception):
+    """A solve finished without a path to show; the message is user-facing"""
+
+
+class PathResult:
+    """Outcome of one shortest-path query.
+
+    path lists the node names in order and steps the (u, v, weight) edges
+    along it; objective is their total weight. For NEGATIVE_CYCLE they
+    describe the cycle found instead, first node repeated at the end.
+    stats holds the engine and its counters (settled nodes, or the
+    model_stats() of a MIP or LP solve); timings maps each solve phase to
+    seconds, plus 'total'.
+    """
+
+    def __init__(self, status, path=None, steps=None, objective=None, stats=None, timings=None):
+        self.status = status
+        self.path = path or []
+        self.steps = steps or []
+        self.objective = objective
+        self.stats = stats or {}
+        self.timings = timings or {}
+
+    @property
+    def optimal(self):
+        return self.status == OPTIMAL
+
+    def __repr__(self):
+        return f"PathResult({self.status!r}, objective={self.objective!r}, path={self.path!r})"
+
+
+class TreeResult:
+    """Outcome of a one-to-all query: the shortest-path tree from source.
+
+    dist, pred and hops are arrays over node ids: distance from source,
+    parent on the tree and number of edges from source. Nodes source
+    cannot reach have inf, -1 and -1; the source has pred -1 and 0 hops.
+    stats and timings are as in PathResult.
+    """
+
+    def __init__(self, source, dist, pred, hops, stats=None, timings=None):
+        self.source = source
+        self.dist = dist
+        self.pred = pred
+        self.hops = hops
+        self.stats = stats or {}
+        self.timings = timings or {}
+
+    @property
+    def reached(self):
+        return int(np.count_nonzero(self.hops >= 0))
+
+
+class Engine:
+    """A shortest-path strategy ShortestPathSolver can dispatch to.
+
+    solve(solver, source, target, worker, timer, stats) returns the node-id
+    path or None, timing its phases on timer (a PhaseTimer) and putting its
+    counters in stats; find_path wraps every engine's answer in the same
+    PathResult, so engines can be swapped freely.
+    """
+
+    def __init__(self, name, label, solve, negative_weights=False):
+        self.name = name
+        self.label = label                        # Shown in the engine menu
+        self.solve = solve
+        self.negative_weights = negative_weights  # Stays exact with negative edge weights
+
+
+def register_engine(name, label, solve, negative_weights=False):
+    ENGINES[name] = Engine(name, label, solve, negative_weights)
+
+
+class PhaseTimer:
+    """Accumulates wall time per named phase of a solve"""
+
+    def __init__(self):
+        self.timings = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    def finish(self):
+        self.timings['total'] = time.perf_counter() - self._started
+        return self.timings
+
+
+class ShortestPathSolver:
+    """Shortest paths on a Graph through any registered engine (see ENGINES).
+
+    Keeps a persistent MIP, the optional ALT and CH indexes, the last
+    network simplex tree and the dynamic tree in step with graph edits.
+    Queries take node names and return PathResult objects; SolveError is
+    raised for unusable input and for cancelled solves. With a cache (a
+    result_cache.ResultCache), find_path answers repeated queries on the
+    same graph content from it without solving.
+    """
+
+    def __init__(self, graph, engine="auto", verify=False, cache=None):
+        self.graph = graph
+        self.engine = engine          # One of ENGINES
+        self.verify = verify          # Cross-check label-setting answers against the MIP
+        self.cache = cache            # ResultCache consulted before any solve
+
+        # Persistent MIP kept alive across queries; only the RHS of the
+        # start/end conservation rows changes between solves
+        self._model = None
+        self._variables = None
+        self._flow_constrs = None
+        self._terminals = ()
+        self._model_version = None
+        self._relaxed = False  # Whether the model's variables are currently continuous
+        self.landmarks = None  # LandmarkIndex for the "alt" engine
+        self.hierarchy = None  # ContractionHierarchy for the "ch" engine
+        self.tree = None       # (source, version, dist, pred) of the last "network" solve
+        self.johnson = None    # JohnsonIndex for the "johnson" engine
+        self.dynamic = None    # DynamicTree for the "dynamic" engine, repaired across edits
+        self._negative_cycle = None  # (version, cycle) when the potentials hit one
+        self._queries = (None, 0)    # (version, queries on it) for the auto engine
+        graph.subscribe(self.on_graph_event)
+
+    def on_graph_event(self, event, index):
+        """Keep the persistent model and the dynamic tree in step with graph edits"""
+        if self.dynamic is not None:
+            if event == CLEARED:
+                self.dynamic = None
+            else:
+                self.dynamic.on_graph_event(event, index)
+        self.landmarks = None  # Any edit, even a weight change, can break the bounds
+        self.hierarchy = None  # ... or make a shortcut stale
+        self.tree = None
+        self.johnson = None
+        self._negative_cycle = None
+        if self._model is None:
+            return
+        if event == WEIGHT_CHANGED:
+            # A new weight is just a new objective coefficient
+            src, dst, weight = self.graph.edge_arrays()
+            self._variables[index].Obj = float(weight[index])
+            self._model_version = self.graph.version
+        else:
+            self.invalidate_model()
+
+    def invalidate_model(self):
+        """Drop the persistent model; called on every structural graph change"""
+        if self._model is not None:
+            self._model.dispose()
+        self._model = None
+        self._variables = None
+        self._flow_constrs = None
+        self._terminals = ()
+
+    def select_engine(self):
+        """Resolve "auto" to the fastest engine that is exact on the current graph.
+
+        With non-negative weights that is a precomputed contraction
+        hierarchy (CH), else precomputed landmarks (ALT), else bidirectional
+        Dijkstra; with negative weights, SPFA for the first query on a
+        graph and Johnson reweighting once more follow (unless the graph
+        has a negative cycle, which blocks the potentials). The network
+        simplex and the Gurobi engines are never picked: they lose to these
+        at every graph size, and Gurobi is capped by the license.
+        """
+        negative = self.graph.min_weight() is not None and self.graph.min_weight() < 0
+        if self.engine != "auto":
+            if self.engine not in ENGINES:
+                raise ValueError(f"Unknown engine: {self.engine}")
+            if negative and not ENGINES[self.engine].negative_weights:
+                raise SolveError(f"{ENGINES[self.engine].label} needs non-negative edge weights.")
+            return self.engine
+        if negative:
+            version = self.graph.version
+            if self._negative_cycle is not None and self._negative_cycle[0] == version:
+                return "spfa"
+            johnson_ready = self.johnson is not None and self.johnson.version == version
+            if johnson_ready or self._queries[1] >= JOHNSON_AFTER_QUERIES:
+                return "johnson"
+            return "spfa"
+        if self.hierarchy is not None and self.hierarchy.version == self.graph.version:
+            return "ch"
+        if self.landmarks is not None and self.landmarks.version == self.graph.version:
+            return "alt"
+        return "bidirectional"
+
+    def ensure_landmarks(self, worker=None):
+        """Return a landmark index for the current graph, building it if needed"""
+        if self.landmarks is None or self.landmarks.version != self.graph.version:
+            self.landmarks = LandmarkIndex.build(self.graph, worker=worker)
+            if self.landmarks is None:
+                raise SolveError("Solve cancelled.")
+        return self.landmarks
+
+    def precompute_landmarks(self, worker=None):
+        """Build the ALT index; returns average settled nodes (Dijkstra, ALT) on sample queries"""
+        if not self.graph.nodes:
+            raise SolveError("The graph is empty. Nothing to precompute.")
+        if self.graph.min_weight() is not None and self.graph.min_weight() < 0:
+            raise SolveError("Landmarks need non-negative edge weights.")
+        return compare_search_space(self.graph, self.ensure_landmarks(worker))
+
+    def ensure_hierarchy(self, worker=None):
+        """Return a contraction hierarchy for the current graph, building it if needed"""
+        if self.hierarchy is None or self.hierarchy.version != self.graph.version:
+            self.hierarchy = ContractionHierarchy.build(self.graph, worker)
+            if self.hierarchy is None:
+                raise SolveError("Solve cancelled.")
+        return self.hierarchy
+
+    def precompute_hierarchy(self, worker=None):
+        """Build the CH index; returns it so the caller can report on and persist it"""
+        if not self.graph.nodes:
+            raise SolveError("The graph is empty. Nothing to precompute.")
+        if self.graph.min_weight() is not None and self.graph.min_weight() < 0:
+            raise SolveError("A contraction hierarchy needs non-negative edge weights.")
+        return self.ensure_hierarchy(worker)
+
+    def ensure_tree(self, source, worker=None, stats=None):
+        """Network simplex shortest-path tree from source as (dist, pred),
+        reused while the source and graph stay the same"""
+        if self.tree is None or self.tree[:2] != (source, self.graph.version):
+            dist, pred = shortest_path_tree(self.graph.csr(), source, stats, worker)
+            if dist is None:
+                raise SolveError("Solve cancelled.")
+            self.tree = (source, self.graph.version, dist, pred)
+        return self.tree[2:]
+
+    def ensure_dynamic(self, source, stats=None):
+        """Dynamic shortest-path tree from source, repaired after edits
+        instead of recomputed while the source stays the same"""
+        if self.dynamic is None or self.dynamic.source != source:
+            self.dynamic = DynamicTree(self.graph, source, stats)
+        else:
+            self.dynamic.repair(stats)
+        return self.dynamic
+
+    def ensure_johnson(self, worker=None, stats=None):
+        """Return Johnson potentials for the current graph, computing them if needed.
+
+        Raises NegativeCycleError if the graph has a negative cycle anywhere;
+        the cycle is remembered until the next edit.
+        """
+        version = self.graph.version
+        if self.johnson is None or self.johnson.version != version:
+            if self._negative_cycle is not None and self._negative_cycle[0] == version:
+                raise NegativeCycleError(self._negative_cycle[1])
+            try:
+                self.johnson = JohnsonIndex.build(self.graph, stats, worker)
+            except NegativeCycleError as e:
+                self._negative_cycle = (version, e.cycle)
+                raise
+            if self.johnson is None:
+                raise SolveError("Solve cancelled.")
+        return self.johnson
+
+    # -- queries -----------------------------------------------------------
+
+    def find_path(self, start, end, worker=None):
+        """Optimal start -> end path as a PathResult.
+
+        Its status is NO_PATH if end cannot be reached and NEGATIVE_CYCLE,
+        with the cycle as path, if the engine ran into one. With a cache, a
+        query already answered on the same graph content is read back from
+        it instead, and stats['cache'] tells which happened.
+        """
+        if not self.graph.nodes:
+            raise SolveError("The graph is empty. Cannot solve the problem.")
+
+        timer = PhaseTimer()
+        if self.cache is None:
+            return self.solve_path(start, end, worker, timer)
+        # Keyed by content, not version: edits change the hash, reloads keep it
+        with timer.phase('cache'):
+            graph_hash = self.graph.content_hash()
+            cached = self.cache.get(graph_hash, start, end, self.engine)
+        if cached is None:
+            result = self.solve_path(start, end, worker, timer)
+            self.cache.put(graph_hash, start, end, self.engine, result)
+        else:
+            status, path, solved_by = cached
+            stats = {'engine': solved_by}
+            if status == NO_PATH:
+                result = PathResult(NO_PATH, stats=stats)
+            else:
+                with timer.phase('extract'):
+                    result = self.path_result(path, stats)
+                result.status = status
+            result.timings = timer.finish()
+        result.stats.update(cache="hit" if cached else "miss", cache_hits=self.cache.hits,
+                            cache_misses=self.cache.misses)
+        return result
+
+    def solve_path(self, start, end, worker=None, timer=None):
+        """find_path() without the cache: always runs the selected engine"""
+        timer = timer or PhaseTimer()
+        source = self.graph.ids[start]
+        target = self.graph.ids[end]
+        version, count = self._queries
+        self._queries = (self.graph.version, count + 1 if version == self.graph.version else 1)
+        engine = self.select_engine()
+        stats = {'engine': engine}
+        try:
+            path = ENGINES[engine].solve(self, source, target, worker, timer, stats)
+        except NegativeCycleError as e:
+            if not (self.engine == "auto" and engine == "johnson"):
+                return self.cycle_result(e.cycle, stats, timer)
+            # The cycle blocks the potentials, but it may not be reachable from start
+            engine = stats['engine'] = "spfa"
+            try:
+                path = ENGINES[engine].solve(self, source, target, worker, timer, stats)
+            except NegativeCycleError as e:
+                return self.cycle_result(e.cycle, stats, timer)
+
+        if path is None:
+            return PathResult(NO_PATH, stats=stats, timings=timer.finish())
+        names = self.graph.names
+        with timer.phase('extract'):
+            result = self.path_result([names[node] for node in path], stats)
+
+        if self.verify and engine not in MODEL_ENGINES:
+            with timer.phase('verify'):
+                mip_path = self.solve_mip(source, target, worker)
+                mip_cost = None if mip_path is None else self.path_weight([names[node] for node in mip_path])
+            if mip_cost is None or abs(mip_cost - result.objective) > 1e-6:
+                raise SolveError("Verification failed: MIP and label-setting costs differ.")
+        result.timings = timer.finish()
+        return result
+
+    def find_tree(self, start, worker=None):
+        """Shortest paths from start to every node in one pass, as a TreeResult.
+
+        With non-negative weights this is the dynamic tree, so asking again
+        after a few edits only repairs it; otherwise SPFA, or the network
+        simplex tree when that engine is selected. A negative cycle
+        reachable from start raises SolveError naming it.
+        """
+        if not self.graph.nodes:
+            raise SolveError("The graph is empty. Cannot solve the problem.")
+        timer = PhaseTimer()
+        source = self.graph.ids[start]
+        negative = self.graph.min_weight() is not None and self.graph.min_weight() < 0
+        stats = {'engine': "network" if self.engine == "network" else "spfa" if negative else "dynamic"}
+        try:
+            with timer.phase('search'):
+                if stats['engine'] == "network":
+                    dist, pred = self.ensure_tree(source, worker, stats)
+                elif stats['engine'] == "spfa":
+                    dist, pred = spfa(self.graph.csr(), source, stats, worker)
+                    if dist is None:
+                        raise SolveError("Solve cancelled.")
+                else:
+                    tree = self.ensure_dynamic(source, stats)
+                    dist, pred = tree.dist, tree.pred
+        except NegativeCycleError as e:
+            cycle = " → ".join(self.graph.names[node] for node in e.cycle)
+            raise SolveError(f"Negative cycle: no shortest-path tree exists. Cycle: {cycle}")
+        with timer.phase('extract'):
+            # Copies, so the result outlives later repairs of the cached trees
+            dist = np.array(dist, dtype=np.float64)
+            pred = np.array(pred, dtype=np.int64)
+            hops = tree_hops(pred)
+            hops[np.isinf(dist)] = -1
+        return TreeResult(source, dist, pred, hops, stats, timer.finish())
+
+    def find_paths(self, start, end, k, worker=None):
+        """The k cheapest loopless start -> end paths as PathResults, cheapest first.
+
+        Uses Yen's algorithm on the label-setting searches, never the MIP.
+        All results share the stats and timings of the one search; the list
+        is empty if end cannot be reached.
+        """
+        if not self.graph.nodes:
+            raise SolveError("The graph is empty. Cannot solve the problem.")
+        if self.graph.min_weight() is not None and self.graph.min_weight() < 0:
+            raise SolveError("K shortest paths need non-negative edge weights.")
+        timer = PhaseTimer()
+        source = self.graph.ids[start]
+        target = self.graph.ids[end]
+        stats = {'engine': "yen"}
+        with timer.phase('search'):
+            paths = k_shortest_paths(self.graph.csr(), self.graph.reverse_csr(), source, target, k, stats, worker)
+        if worker is not None and worker.cancelled:
+            raise SolveError("Solve cancelled.")
+        names = self.graph.names
+        with timer.phase('extract'):
+            results = [self.path_result([names[node] for node in path], stats) for _, path in paths]
+        timings = timer.finish()
+        for result in results:
+            result.timings = timings
+        return results
+
+    def path_result(self, path, stats=None, timings=None):
+        """An OPTIMAL PathResult for a known node-name path, with its step weights"""
+        steps = [(u, v, self.graph.weight(u, v)) for u, v in zip(path, path[1:])]
+        return PathResult(OPTIMAL, path, steps, sum(weight for _, _, weight in steps), stats, timings)
+
+    def cycle_result(self, cycle, stats, timer):
+        """A NEGATIVE_CYCLE PathResult for a cycle of node ids"""
+        names = self.graph.names
+        with timer.phase('extract'):
+            result = self.path_result([names[node] for node in cycle], stats)
+        result.status = NEGATIVE_CYCLE
+        result.timings = timer.finish()
+        return result
+
+    def path_weight(self, path):
+        return sum(self.graph.weight(u, v) for u, v in zip(path, path[1:]))
+
+    # -- MIP ---------------------------------------------------------------
+
+    def build_model(self):
+        """Build the node-arc MIP with all conservation rows at RHS 0"""
+        model = grb.Model("ShortestPath")
+        model.setParam('OutputFlag', 0)  # Disable Gurobi output
+
+        # Add one binary variable per edge slot, with the edge weight as
+        # objective coefficient (minimize total weight of selected edges)
+        _, _, weight = self.graph.edge_arrays()
+        variables = list(model.addVars(len(weight), vtype=grb.GRB.BINARY, obj=weight.tolist()).values())
+        model.ModelSense = grb.GRB.MINIMIZE
+
+        # Flow constraints, built from the forward/reverse CSR rows so each
+        # edge is touched exactly twice instead of once per node:
+        csr, reverse = self.graph.csr(), self.graph.reverse_csr()
+        flow_constrs = []
+        for node in range(self.graph.number_of_nodes()):
+            lo, hi = csr.row(node)
+            outflow = [variables[slot] for slot in csr.edge_ids[lo:hi].tolist()]
+            lo, hi = reverse.row(node)
+            inflow = [variables[slot] for slot in reverse.edge_ids[lo:hi].tolist()]
+            expr = grb.LinExpr([1.0] * len(outflow) + [-1.0] * len(inflow), outflow + inflow)
+            flow_constrs.append(model.addLConstr(expr, grb.GRB.EQUAL, 0, name=f"flow_{node}"))
+
+        self._model = model
+        self._variables = variables
+        self._flow_constrs = flow_constrs
+        self._terminals = ()
+        self._model_version = self.graph.version
+        self._relaxed = False
+
+    def set_terminals(self, source, target):
+        """Move the +1/-1 supply to a new source/target pair by editing two RHS values"""
+        for node in self._terminals:
+            self._flow_constrs[node].RHS = 0
+        self._flow_constrs[source].RHS = 1
+        self._flow_constrs[target].RHS = -1
+        self._terminals = (source, target)
+
+    def solve_mip(self, source, target, worker=None, timer=None, stats=None, relaxed=False):
+        """Solve the node-arc binary MIP; returns the ordered node-id path or None.
+
+        relaxed solves the LP relaxation instead (same model, continuous
+        variables in [0, 1]). timer (a PhaseTimer) gets the build, optimize
+        and extract phases and stats the model_stats() counters.
+        """
+        timer = timer or PhaseTimer()
+        with timer.phase('build'):
+            if self._model is None or self._model_version != self.graph.version:
+                self.invalidate_model()
+                self.build_model()
+            if self._terminals != (source, target):
+                self.set_terminals(source, target)
+            if self._relaxed != relaxed:
+                vtype = grb.GRB.CONTINUOUS if relaxed else grb.GRB.BINARY
+                self._model.setAttr('VType', self._variables, [vtype] * len(self._variables))
+                self._relaxed = relaxed
+
+        # Re-optimizing the same model lets Gurobi warm-start from the
+        # previous solve instead of starting cold
+        model = self._model
+        if worker is not None:
+            worker.set_stop(model.terminate)
+            if worker.cancelled:
+                raise SolveError("Solve cancelled.")
+        with timer.phase('optimize'):
+            model.optimize()
+        if stats is not None:
+            stats.update(model_stats(model))
+
+        if model.status == grb.GRB.INTERRUPTED:
+            raise SolveError("Solve cancelled.")
+        if model.status != grb.GRB.OPTIMAL:
+            return None
+
+        # Trace the ordered path through a successor map of the selected edges
+        with timer.phase('extract'):
+            src, dst, _ = self.graph.edge_arrays()
+            selected = np.flatnonzero(np.array(model.getAttr('X', self._variables)) > 0.5)
+            successor = dict(zip(src[selected].tolist(), dst[selected].tolist()))
+            current_node = source
+            path = [current_node]
+            while current_node != target:
+                current_node = successor[current_node]
+                path.append(current_node)
+        return path
+
+
+# -- engines ---------------------------------------------------------------
+
+def _solve_ch(solver, source, target, worker, timer, stats):
+    with timer.phase('index'):
+        hierarchy = solver.ensure_hierarchy(worker)
+    with timer.phase('search'):
+        return hierarchy.query(source, target, stats)[1]
+
+
+def _solve_alt(solver, source, target, worker, timer, stats):
+    with timer.phase('index'):
+        heuristic = solver.ensure_landmarks(worker).heuristic(target)
+    with timer.phase('search'):
+        return astar(solver.graph.csr(), source, target, heuristic, stats)[1]
+
+
+def _solve_bidirectional(solver, source, target, worker, timer, stats):
+    with timer.phase('search'):
+        return bidirectional_dijkstra(solver.graph.csr(), solver.graph.reverse_csr(), source, target, stats)[1]
+
+
+def _solve_dijkstra(solver, source, target, worker, timer, stats):
+    with timer.phase('search'):
+        return shortest_path(solver.graph.csr(), source, target, stats)[1]
+
+
+def _solve_network(solver, source, target, worker, timer, stats):
+    with timer.phase('search'):
+        dist, pred = solver.ensure_tree(source, worker, stats)
+    return tree_path(dist, pred, target)[1]
+
+
+def _solve_dynamic(solver, source, target, worker, timer, stats):
+    with timer.phase('search'):
+        tree = solver.ensure_dynamic(source, stats)
+    return tree.path(target)[1]
+
+
+def _solve_spfa(solver, source, target, worker, timer, stats):
+    with timer.phase('search'):
+        path = bellman_ford_path(solver.graph.csr(), source, target, stats, worker)[1]
+    if worker is not None and worker.cancelled:
+        raise SolveError("Solve cancelled.")
+    return path
+
+
+def _solve_johnson(solver, source, target, worker, timer, stats):
+    with timer.phase('index'):
+        johnson = solver.ensure_johnson(worker)
+    with timer.phase('search'):
+        return johnson.query(source, target, stats)[1]
+
+
+def _solve_lp(solver, source, target, worker, timer, stats):
+    _check_cycles(solver, worker, timer)
+    return solver.solve_mip(source, target, worker, timer, stats, relaxed=True)
+
+
+def _solve_mip(solver, source, target, worker, timer, stats):
+    _check_cycles(solver, worker, timer)
+    return solver.solve_mip(source, target, worker, timer, stats)
+
+
+def _check_cycles(solver, worker, timer):
+    # The node-arc model happily routes flow around a negative cycle anywhere
+    # in the graph, so find one first instead of solving a meaningless model
+    if solver.graph.min_weight() is not None and solver.graph.min_weight() < 0:
+        with timer.phase('index'):
+            solver.ensure_johnson(worker)
+
+
+register_engine("ch", "Contraction hierarchy", _solve_ch)
+register_engine("alt", "A* with landmarks", _solve_alt)
+register_engine("bidirectional", "Bidirectional Dijkstra", _solve_bidirectional)
+register_engine("dijkstra", "Dijkstra", _solve_dijkstra)
+register_engine("dynamic", "Dynamic shortest-path tree", _solve_dynamic)
+register_engine("spfa", "Bellman-Ford (SPFA)", _solve_spfa, negative_weights=True)
+register_engine("johnson", "Johnson reweighting", _solve_johnson, negative_weights=True)
+register_engine("network", "Network simplex", _solve_network, negative_weights=True)
+register_engine("lp", "LP relaxation (Gurobi)", _solve_lp, negative_weights=True)
+register_engine("mip", "Binary MIP (Gurobi)", _solve_mip, negative_weights=True)
@@ -0,0 +1,103 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Shortest-path answers kept across sessions in a local SQLite file. Entries
+# are keyed by Graph.content_hash() plus (start, end, engine), so reloading
+# the same graph finds its answers again, while any edit changes the hash
+# and simply stops matching the old entries, which then age out: past
+# max_entries the least recently used ones are evicted.
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "probleme1", "results.sqlite")
+DEFAULT_MAX_ENTRIES = 10_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    graph TEXT NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    status TEXT NOT NULL,
+    path TEXT NOT NULL,
+    solved_by TEXT NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (graph, source, target, engine)
+);
+CREATE INDEX IF NOT EXISTS results_used ON results (used);
+"""
+
+
+class ResultCache:
+    """Size-bounded LRU cache of PathResults in SQLite.
+
+    get() returns (status, path, solved_by) for a key or None; put() stores
+    a result. hits and misses count this session's lookups. Database errors
+    (a locked or unwritable file) count as misses and skipped writes, since
+    the cache is only an optimisation.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Solves run on worker threads, one at a time; the lock keeps it that way
+        self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def get(self, graph_hash, start, end, engine):
+        key = (graph_hash, start, end, engine)
+        try:
+            with self._lock, self._db:
+                row = self._db.execute("SELECT status, path, solved_by FROM results "
+                                       "WHERE graph = ? AND source = ? AND target = ? AND engine = ?",
+                                       key).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE results SET used = ? "
+                                     "WHERE graph = ? AND source = ? AND target = ? AND engine = ?",
+                                     (time.time(),) + key)
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        status, path, solved_by = row
+        return status, json.loads(path), solved_by
+
+    def put(self, graph_hash, start, end, engine, result):
+        """Store a PathResult, then evict the least recently used entries past max_entries"""
+        try:
+            with self._lock, self._db:
+                self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                 (graph_hash, start, end, engine, result.status, json.dumps(result.path),
+                                  result.stats.get('engine', engine), time.time()))
+                self._db.execute("DELETE FROM results WHERE rowid IN "
+                                 "(SELECT rowid FROM results ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                                 (self.max_entries,))
+        except sqlite3.Error:
+            pass
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM results")
+
+    def close(self):
+        self._db.close()
+
+
+def open_cache(path=DEFAULT_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+    """A ResultCache at path, or None if the file cannot be opened"""
+    try:
+        return ResultCache(path, max_entries)
+    except (OSError, sqlite3.Error):
+        return None
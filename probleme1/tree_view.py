@@ -0,0 +1,97 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (QDialog, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QMessageBox,
+                             QPushButton, QTableView, QVBoxLayout)
+from .graph_io import save_tree
+from .graph_models import TreeTableModel
+
+
+class TreeDialog(QDialog):
+    """Shortest-path tree from one start node (a TreeResult) as a sortable
+    table of every node, with CSV/NPY export"""
+
+    def __init__(self, names, tree, colors=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Shortest Paths to All Nodes")
+        self.resize(600, 500)
+        self.names = names
+        self.tree = tree
+        self.colors = colors or {
+            "primary": "#4a6da7",
+            "secondary": "#6c5ce7",
+            "success": "#00b894",
+            "danger": "#d63031",
+            "warning": "#fdcb6e",
+            "dark": "#2d3436",
+            "light": "#dfe6e9",
+            "background": "#1e1e2e",
+            "card": "#2a2a3a",
+            "text": "#ffffff"
+        }
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"From {names[tree.source]}: {tree.reached} of {len(names)} nodes reached"))
+
+        # Only the rows in view are ever asked for, so any tree size opens instantly
+        self.model = TreeTableModel(names, tree, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(1, Qt.AscendingOrder)  # Nearest first
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        layout.addWidget(self.table)
+
+        self.setStyleSheet(f"""
+            QDialog {{
+                background-color: {self.colors['background']};
+            }}
+            QLabel {{
+                color: {self.colors['text']};
+            }}
+            QTableView {{
+                background-color: {self.colors['card']};
+                color: {self.colors['text']};
+                border: 1px solid {self.colors['dark']};
+                gridline-color: {self.colors['dark']};
+                selection-background-color: {self.colors['primary']};
+                selection-color: {self.colors['text']};
+            }}
+            QHeaderView::section {{
+                background-color: {self.colors['dark']};
+                color: {self.colors['text']};
+                font-weight: bold;
+                border: none;
+            }}
+            QPushButton {{
+                background-color: {self.colors['primary']};
+                color: {self.colors['text']};
+                border: none;
+                border-radius: 5px;
+                padding: 8px 18px;
+                font-weight: bold;
+            }}
+            QPushButton:hover {{
+                background-color: {self.colors['secondary']};
+            }}
+        """)
+
+        button_layout = QHBoxLayout()
+        export_btn = QPushButton("Export...")
+        export_btn.clicked.connect(self.export)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addStretch()
+        button_layout.addWidget(export_btn)
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Tree", "", "CSV Files (*.csv);;NumPy Array (*.npy)")
+        if not path:
+            return
+        try:
+            save_tree(path, self.names, self.tree)
+        except OSError as e:
+            QMessageBox.warning(self, "Export failed", str(e))
@@ -1,7 +1,16 @@
+import time
 import gurobipy as gp
 from gurobipy import GRB
+from shared import load_shared  # Registered by SolveurPL, which loads this file
 
-def solve_lp(variable_names, c, A, b, sense, objective_type=GRB.MINIMIZE):
+model_stats = load_shared("solve_stats").model_stats
+
+
+def solve_lp(variable_names, c, A, b, sense, objective_type=GRB.MINIMIZE, worker=None):
+    # "stats" holds model_stats() once the model is optimized and "timings"
+    # the seconds spent building, optimizing and reading the solution
+    started = time.perf_counter()
+    timings = {}
     model = gp.Model("generic_lp")
 
     n = len(c)
@@ -17,9 +26,20 @@ def solve_lp(variable_names, c, A, b, sense, objective_type=GRB.MINIMIZE):
             model.addConstr(gp.quicksum(A[i][j] * x[variable_names[j]] for j in range(n)) == b[i], name=f"constraint_{i}")
         else:
             raise ValueError(f"Invalid constraint sense: {sense[i]}")
+    model.update()
+    timings["build"] = time.perf_counter() - started
 
+    # Let a SolveWorker interrupt the solve from the GUI thread
+    if worker is not None:
+        worker.set_stop(model.terminate)
+        if worker.cancelled:
+            timings["total"] = time.perf_counter() - started
+            return {"objective_value": None, "variables": None, "stats": {}, "timings": timings}
+    phase = time.perf_counter()
     model.optimize()
+    timings["optimize"] = time.perf_counter() - phase
 
+    phase = time.perf_counter()
     if model.status == GRB.OPTIMAL:
         solution = {
             "objective_value": model.objVal,
@@ -30,5 +50,9 @@ def solve_lp(variable_names, c, A, b, sense, objective_type=GRB.MINIMIZE):
             "objective_value": None,
             "variables": None
         }
+    timings["extract"] = time.perf_counter() - phase
+    timings["total"] = time.perf_counter() - started
+    solution["stats"] = model_stats(model)
+    solution["timings"] = timings
 
     return solution
@@ -1,7 +1,18 @@
+import time
 import gurobipy as gp
 from gurobipy import GRB
+from shared import load_shared  # Registered by SolveurPL, which loads this file
 
-def solve_knapsack(values, weights, capacity):
+model_stats = load_shared("solve_stats").model_stats
+
+
+def solve_knapsack(values, weights, capacity, names=None, worker=None):
+    # Returns the same solution dict as PL.solve_lp: "variables" holds the
+    # chosen items (by names[i] when given, else by index) and their counts,
+    # "stats" model_stats() once the model is optimized and "timings" the
+    # seconds spent building, optimizing and reading the solution
+    started = time.perf_counter()
+    timings = {}
     model = gp.Model("Knapsack Problem")
 
     num_items = len(values)
@@ -11,11 +22,35 @@ def solve_knapsack(values, weights, capacity):
     model.setObjective(obj, GRB.MAXIMIZE)
 
     model.addConstr(gp.quicksum(weights[i] * x[i] for i in range(num_items)) <= capacity, name="Capacity")
+    model.update()
+    timings["build"] = time.perf_counter() - started
 
+    # Let a SolveWorker interrupt the solve from the GUI thread
+    if worker is not None:
+        worker.set_stop(model.terminate)
+        if worker.cancelled:
+            timings["total"] = time.perf_counter() - started
+            return {"objective_value": None, "variables": None, "stats": {}, "timings": timings}
+    phase = time.perf_counter()
     model.optimize()
+    timings["optimize"] = time.perf_counter() - phase
+
+    phase = time.perf_counter()
+    if model.status == GRB.OPTIMAL:
+        selected_items = {i: int(x[i].x) for i in range(num_items) if x[i].x > 0}
+        total_value = sum(values[i] * selected_items[i] for i in selected_items)
+        solution = {
+            "objective_value": total_value,
+            "variables": {names[i] if names else i: count for i, count in selected_items.items()}
+        }
+    else:
+        solution = {
+            "objective_value": None,
+            "variables": None
+        }
+    timings["extract"] = time.perf_counter() - phase
+    timings["total"] = time.perf_counter() - started
+    solution["stats"] = model_stats(model)
+    solution["timings"] = timings
 
-    selected_items = {i: int(x[i].x) for i in range(num_items) if x[i].x > 0}
-    total_value = sum(values[i] * selected_items[i] for i in selected_items)
-    print(selected_items)
-    print(total_value)
-    return total_value, selected_items
+    return solution
@@ -10,16 +10,26 @@ from gurobipy import GRB
 import importlib.util
 import os
 
-# Dynamically import PL from the same directory as this file
-spec = importlib.util.spec_from_file_location("PL", os.path.join(os.path.dirname(__file__), "PL.py"))
-PL = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(PL)
+# Sibling modules and the ones shared with probleme1 and probleme2 load
+# through shared.py, registered first (see there)
+if "shared" not in sys.modules:
+    spec = importlib.util.spec_from_file_location("shared", os.path.join(os.path.dirname(__file__), "shared.py"))
+    sys.modules["shared"] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sys.modules["shared"])
+from shared import load, load_shared
+
+# Dynamically import PL and PLNE from the same directory as this file
+PL = load("PL", "PL.py")
 solve_lp = PL.solve_lp
+PLNE = load("PLNE", "PLNE.py")
+SolveWorker = load_shared("solve_worker").SolveWorker
+StatsPanel = load_shared("stats_panel").StatsPanel
 
 class LPApp(QMainWindow):
     def __init__(self, home_window=None):
         super().__init__()
         self.home_window = home_window
+        self.worker = None  # SolveWorker running the current solve, if any
         self.setWindowTitle("Solveur de Problèmes de Programmation Linéaire")
         self.setMinimumSize(1600, 1000)
         # Modern color palette matching home.py
@@ -102,18 +112,29 @@ class LPApp(QMainWindow):
         self.objective_type_input = self.createStyledComboBox()
         self.objective_type_input.addItems(["Minimiser", "Maximiser"])
         self.objective_type_layout.addRow(self.createStyledLabel("Type d'objectif:", 14), self.objective_type_input)
+        # The knapsack reads the coefficients as item values and the single
+        # constraint row as item weights <= capacity, with integer variables
+        self.problem_type_input = self.createStyledComboBox()
+        self.problem_type_input.addItems(["PL (variables continues)", "PLNE : sac à dos (variables entières)"])
+        self.objective_type_layout.addRow(self.createStyledLabel("Type de problème:", 14), self.problem_type_input)
         self.layout.addLayout(self.objective_type_layout)
 
         # Solve Button
         self.solve_button = self.createStyledButton("Résoudre", self.solve_lp, color="#2979FF")
         self.layout.addWidget(self.solve_button)
 
+        # Cancel Button, only enabled while a solve is running
+        self.cancel_button = self.createStyledButton("Annuler", self.cancel_solve, color="#fdcb6e")
+        self.cancel_button.setEnabled(False)
+        self.layout.addWidget(self.cancel_button)
+
         # Reset Button
         self.reset_button = self.createStyledButton("Réinitialiser", self.reset_form, color="#f44336")
         self.layout.addWidget(self.reset_button)
 
         # Center buttons
-        self.center_buttons([self.add_variable_button, self.add_constraint_button, self.solve_button, self.reset_button])
+        self.center_buttons([self.add_variable_button, self.add_constraint_button, self.solve_button,
+                             self.cancel_button, self.reset_button])
 
         # Result Section
         self.result_label = self.createStyledLabel("Résultats:", 18)
@@ -126,6 +147,9 @@ class LPApp(QMainWindow):
         self.result_output.setFont(QFont("Trebuchet MS", 14, QFont.Bold))
         self.layout.addWidget(self.result_output)
 
+        self.stats_panel = StatsPanel(self, title="Statistiques de résolution")
+        self.layout.addWidget(self.stats_panel)
+
         self.variable_names = []
         self.coefficients = []
 
@@ -313,6 +337,7 @@ class LPApp(QMainWindow):
         self.constraints_table.setRowCount(0)
         self.update_table_columns()
         self.result_output.clear()
+        self.stats_panel.clear()
 
     def solve_lp(self):
         try:
@@ -329,18 +354,58 @@ class LPApp(QMainWindow):
 
             objective_type = GRB.MINIMIZE if self.objective_type_input.currentText().lower() == 'minimiser' else GRB.MAXIMIZE
 
-            result = PL.solve_lp(self.variable_names, self.coefficients, A, b, sens, objective_type)
-
-            if result["objective_value"] is not None:
-                result_text = f"Valeur optimale de l'objectif: {result['objective_value']}\n"
-                for var, value in result["variables"].items():
-                    result_text += f"{var}: {value}\n"
-            else:
-                result_text = "Aucune solution optimale trouvée."
-
-            self.result_output.setText(result_text)
+            variable_names, coefficients = list(self.variable_names), list(self.coefficients)
+            knapsack = self.problem_type_input.currentIndex() == 1
+            if knapsack and (objective_type != GRB.MAXIMIZE or sens != ['<=']):
+                raise ValueError("Le sac à dos se maximise, avec une seule contrainte de capacité '<='.")
         except Exception as e:
             QMessageBox.critical(self, "Erreur", str(e), QMessageBox.Ok)
+            return
+
+        # Solve on a worker thread so the window stays responsive
+        if knapsack:
+            task = lambda worker: PLNE.solve_knapsack(coefficients, A[0], b[0], variable_names, worker=worker)
+        else:
+            task = lambda worker: PL.solve_lp(variable_names, coefficients, A, b, sens, objective_type, worker=worker)
+        self.worker = SolveWorker(task, self)
+        self.worker.tick.connect(lambda elapsed: self.statusBar().showMessage(f"Résolution... {elapsed:.1f} s"))
+        self.worker.succeeded.connect(self.show_lp_result)
+        self.worker.failed.connect(lambda e: QMessageBox.critical(self, "Erreur", str(e), QMessageBox.Ok))
+        self.worker.finished.connect(self.on_solve_finished)
+        self.solve_button.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.worker.start()
+
+    def show_lp_result(self, result):
+        if self.worker.cancelled:
+            result_text = "Résolution annulée."
+        elif result["objective_value"] is not None:
+            result_text = f"Valeur optimale de l'objectif: {result['objective_value']}\n"
+            for var, value in result["variables"].items():
+                result_text += f"{var}: {value}\n"
+        else:
+            result_text = "Aucune solution optimale trouvée."
+
+        self.result_output.setText(result_text)
+        self.stats_panel.show_stats(result["stats"], result["timings"])
+
+    def cancel_solve(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def on_solve_finished(self):
+        self.statusBar().showMessage(f"Résolution terminée en {self.worker.elapsed():.2f} s", 3000)
+        self.solve_button.setEnabled(True)
+        self.cancel_button.setEnabled(False)
+        self.worker.deleteLater()
+        self.worker = None
+
+    def closeEvent(self, event):
+        # Never leave a solve thread running behind a closed window
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
 
 
 if __name__ == "__main__":
@@ -4,14 +4,29 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QH
                              QLineEdit, QComboBox, QCheckBox)
 from PyQt5.QtGui import QFont, QColor, QPalette
 from PyQt5.QtCore import Qt
+import importlib.util
+import os
 import pulp
 
+# Sibling modules and the ones shared with probleme1 and probleme2 load
+# through shared.py, registered first (see there)
+if "shared" not in sys.modules:
+    spec = importlib.util.spec_from_file_location("shared", os.path.join(os.path.dirname(__file__), "shared.py"))
+    sys.modules["shared"] = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(sys.modules["shared"])
+from shared import load, load_shared
+
+SolveWorker = load_shared("solve_worker").SolveWorker
+# CBC in a child process Cancel can kill, from the same directory as this file
+solve_cbc = load("worker", "worker.py").solve_cbc
+
 class PharmaSolver(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Pharmaceutical Formulation Cost Optimizer")
         self.setMinimumSize(1400, 1100)  # Increased width and height for better table visibility
         self.ingredients = []
+        self.worker = None  # SolveWorker running the current solve, if any
         # Theme colors (aligned with home.py)
         self.colors = {
             "primary": "#4a6da7",
@@ -235,9 +250,16 @@ class PharmaSolver(QMainWindow):
         layout.addWidget(self.total_quantity_input)
 
         # Solve button
-        solve_btn = self.create_button("Solve", self.colors["primary"])
-        solve_btn.clicked.connect(self.solve)
-        layout.addWidget(solve_btn)
+        solve_layout = QHBoxLayout()
+        self.solve_btn = self.create_button("Solve", self.colors["primary"])
+        self.solve_btn.clicked.connect(self.solve)
+        self.cancel_btn = self.create_button("Cancel", self.colors["danger"])
+        self.cancel_btn.clicked.connect(self.cancel_solve)
+        self.cancel_btn.setEnabled(False)
+        solve_layout.addWidget(self.solve_btn)
+        solve_layout.addWidget(self.cancel_btn)
+        solve_layout.addStretch()
+        layout.addLayout(solve_layout)
 
         # Results output
         self.result_output = QTextEdit()
@@ -362,19 +384,51 @@ class PharmaSolver(QMainWindow):
             diagnostic += f"Min stability: {min_stability}\n\n"
             self.result_output.setText(diagnostic)
 
-            status = model.solve()
-            if status != pulp.LpStatusOptimal:
-                self.result_output.setText("Aucune solution optimale trouvée.")
-                return
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
 
-            result_text = f"\nTotal Cost: {pulp.value(model.objective):.2f}\n"
-            for j in range(len(names)):
-                result_text += f"{names[j]}: {x[j].varValue:.4f} kg\n"
+        # CBC runs as a child process on a worker thread; Cancel kills it
+        self.worker = SolveWorker(lambda worker: solve_cbc(model, worker), self)
+        self.worker.tick.connect(lambda elapsed: self.statusBar().showMessage(f"Solving... {elapsed:.1f} s"))
+        self.worker.succeeded.connect(lambda status: self.show_result(status, model, names, x))
+        self.worker.failed.connect(lambda e: QMessageBox.critical(self, "Error", str(e)))
+        self.worker.finished.connect(self.on_solve_finished)
+        self.solve_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.worker.start()
 
-            self.result_output.setText(result_text)
+    def show_result(self, status, model, names, x):
+        if status is None:
+            self.result_output.setText("Solve cancelled.")
+            return
+        if status != pulp.LpStatusOptimal:
+            self.result_output.setText("Aucune solution optimale trouvée.")
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+        result_text = f"\nTotal Cost: {pulp.value(model.objective):.2f}\n"
+        for j in range(len(names)):
+            result_text += f"{names[j]}: {x[j].varValue:.4f} kg\n"
+
+        self.result_output.setText(result_text)
+
+    def cancel_solve(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def on_solve_finished(self):
+        self.statusBar().showMessage(f"Solve finished in {self.worker.elapsed():.2f} s", 3000)
+        self.solve_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.worker.deleteLater()
+        self.worker = None
+
+    def closeEvent(self, event):
+        # Never leave CBC running behind a closed window
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -0,0 +1,26 @@
+import importlib.util
+import os
+import sys
+
+# This directory's name has a space, so it is no package and its files load
+# one another by path. load() does that in one place and once per module:
+# every module it loads goes into sys.modules under its name. SolveurPL and
+# pharma, the entry points, register this helper itself there as "shared",
+# so the modules they load can simply import it.
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load(name, *path):
+    """Module name from the file at path (relative to this directory), loaded once"""
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, *path))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+def load_shared(name):
+    """A module shared with probleme1 and probleme2, next to home.py"""
+    return load(name, "..", f"{name}.py")
@@ -0,0 +1,75 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import pulp
+
+# The child process rebuilds the problem from PuLP's dict form, solves it
+# with the stock CBC command and prints the solution back as JSON
+CHILD_SCRIPT = """
+import json, sys, pulp
+_, problem = pulp.LpProblem.from_dict(json.load(sys.stdin))
+problem.solve(pulp.PULP_CBC_CMD(msg=False))
+json.dump({
+    "status": problem.status, "sol_status": problem.sol_status,
+    "values": {v.name: v.varValue for v in problem.variables()},
+    "dj": {v.name: v.dj for v in problem.variables()},
+    "pi": {name: c.pi for name, c in problem.constraints.items()},
+    "slack": {name: c.slack for name, c in problem.constraints.items()},
+}, sys.stdout)
+"""
+
+
+def solve_cbc(problem, worker=None):
+    """Solve a PuLP problem with PULP_CBC_CMD in a child process that Cancel can kill.
+
+    The solution (values, reduced costs, duals and slacks) is copied back
+    onto problem's variables and constraints. Returns the PuLP status
+    code, or None if the solve was cancelled.
+    """
+    if sys.platform == "win32":
+        # No console window from the GUI, and a process group taskkill can end
+        options = {'creationflags': subprocess.CREATE_NO_WINDOW | subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        options = {'start_new_session': True}  # So a kill reaches CBC too
+    process = subprocess.Popen([sys.executable, "-c", CHILD_SCRIPT], stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **options)
+    if worker is not None:
+        worker.set_stop(lambda: _kill_tree(process))
+    output, errors = process.communicate(json.dumps(problem.to_dict()))
+
+    if worker is not None and worker.cancelled:
+        return None
+    if process.returncode != 0:
+        raise pulp.PulpSolverError(f"Pulp: CBC solve failed\n{errors.strip()}")
+
+    solution = json.loads(output)
+    for variable in problem.variables():
+        variable.varValue = solution["values"].get(variable.name)
+        variable.dj = solution["dj"].get(variable.name)
+    for name, constraint in problem.constraints.items():
+        constraint.pi = solution["pi"].get(name)
+        constraint.slack = solution["slack"].get(name)
+    problem.status = solution["status"]
+    problem.sol_status = solution["sol_status"]
+    return problem.status
+
+
+def _kill_tree(process):
+    """Kill the child and the CBC process it started.
+
+    Called from the GUI thread; the solve thread's communicate() reaps the
+    child either way.
+    """
+    if process.poll() is not None:
+        return
+    if sys.platform == "win32":
+        # taskkill just fails quietly if the child is already gone
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True,
+                       creationflags=subprocess.CREATE_NO_WINDOW)
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass  # The child exited after poll() above
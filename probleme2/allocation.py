@@ -0,0 +1,118 @@
+import time
+import gurobipy as grb
+from solve_stats import model_stats  # Shared with probleme1, next to home.py
+
+# Qt-free core of the resource allocation LP: solve_allocation returns an
+# AllocationResult and never touches a widget, so it can run headless.
+# resource_solver.ResourceSolver adapts it to the GUI.
+
+# AllocationResult statuses
+OPTIMAL = "optimal"
+INFEASIBLE = "infeasible"
+UNBOUNDED = "unbounded"
+CANCELLED = "cancelled"
+INVALID = "invalid"  # Inputs rejected before or while building the model
+ERROR = "error"      # Gurobi raised
+OTHER = "other"      # Any other final Gurobi status, kept in stats['gurobi_status']
+
+
+class AllocationResult:
+    """Outcome of one allocation solve.
+
+    values[i] is the amount of activity i and objective the total cost
+    (both only when OPTIMAL); conflicts names the constraints of an
+    irreducible infeasible subsystem when one could be computed; message
+    explains INVALID and ERROR. stats holds the model_stats() counters
+    once the model was optimized, timings seconds per phase plus 'total'.
+    """
+
+    def __init__(self, status, values=None, objective=None, conflicts=None, message="", stats=None, timings=None):
+        self.status = status
+        self.values = values or []
+        self.objective = objective
+        self.conflicts = conflicts
+        self.message = message
+        self.stats = stats or {}
+        self.timings = timings or {}
+
+    @property
+    def optimal(self):
+        return self.status == OPTIMAL
+
+    def __repr__(self):
+        return f"AllocationResult({self.status!r}, objective={self.objective!r})"
+
+
+def solve_allocation(costs, constraints, demand=None, max_value=None, worker=None):
+    """Minimise sum(costs[i] * x[i]) subject to sum(a_ij * x[i]) <= b_j per (a_ij, b_j).
+
+    x is non-negative, at most max_value each when given, and sums to at
+    least demand when demand is positive. worker (a SolveWorker) can
+    interrupt the optimize. Returns an AllocationResult; never raises.
+    """
+    started = time.perf_counter()
+    timings = {}
+
+    def result(status, **fields):
+        timings['total'] = time.perf_counter() - started
+        return AllocationResult(status, timings=timings, **fields)
+
+    if not costs or not constraints:
+        return result(INVALID, message="Invalid input data.")
+    for a_ij, b_j in constraints:
+        if len(a_ij) != len(costs):
+            return result(INVALID, message=f"Constraint {a_ij} has wrong length. Expected {len(costs)} values.")
+
+    try:
+        phase = time.perf_counter()
+        model = grb.Model("ResourceAllocation")
+        model.setParam('OutputFlag', 0)
+
+        activities = range(len(costs))
+        # Set upper bound if max_value is provided
+        if max_value is not None:
+            x = [model.addVar(lb=0, ub=max_value, name=f"x_{i}") for i in activities]
+        else:
+            x = [model.addVar(lb=0, name=f"x_{i}") for i in activities]
+
+        if demand is not None and demand > 0:
+            model.addConstr(grb.quicksum(x[i] for i in activities) >= demand, name="demand")
+
+        model.setObjective(grb.quicksum(costs[i] * x[i] for i in activities), sense=grb.GRB.MINIMIZE)
+
+        for j, (a_ij, b_j) in enumerate(constraints):
+            model.addConstr(grb.quicksum(a_ij[i] * x[i] for i in activities) <= b_j, name=f"constr_{j}")
+        model.update()
+        timings['build'] = time.perf_counter() - phase
+
+        if worker is not None:
+            worker.set_stop(model.terminate)
+            if worker.cancelled:
+                return result(CANCELLED)
+        phase = time.perf_counter()
+        model.optimize()
+        timings['optimize'] = time.perf_counter() - phase
+        stats = model_stats(model)
+        stats['gurobi_status'] = model.status
+
+        if model.status == grb.GRB.OPTIMAL:
+            return result(OPTIMAL, values=[var.x for var in x], objective=model.objVal, stats=stats)
+        elif model.status == grb.GRB.INFEASIBLE:
+            phase = time.perf_counter()
+            try:
+                model.computeIIS()
+                conflicts = [c.constrName for c in model.getConstrs() if c.IISConstr]
+            except grb.GurobiError:
+                conflicts = None
+            timings['iis'] = time.perf_counter() - phase
+            return result(INFEASIBLE, conflicts=conflicts, stats=stats)
+        elif model.status == grb.GRB.UNBOUNDED:
+            return result(UNBOUNDED, stats=stats)
+        elif model.status == grb.GRB.INTERRUPTED:
+            return result(CANCELLED, stats=stats)
+        return result(OTHER, stats=stats)
+
+    except grb.GurobiError as e:
+        return result(ERROR, message=f"Solver error: {e}")
+    except Exception as e:
+        return result(INVALID, message=f"Unexpected error: {e}")
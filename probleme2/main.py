@@ -7,6 +7,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QPalette, QColor
 import csv
+from solve_worker import SolveWorker  # Shared with probleme1, next to home.py
+from stats_panel import StatsPanel
 from .resource_solver import ResourceSolver
 
 class ResourceAllocator(QMainWindow):
@@ -17,6 +19,7 @@ class ResourceAllocator(QMainWindow):
         self.setMinimumSize(1800, 1000)
         self.costs = []
         self.constraints = []
+        self.worker = None  # SolveWorker running the current solve, if any
         
         # Modern color palette
         self.colors = {
@@ -154,13 +157,17 @@ class ResourceAllocator(QMainWindow):
         action_card = self.create_card("⚡ ACTIONS")
         self.demand_input = self.create_input("Min Demand:", initial_value="5.0")
         self.max_value_input = self.create_input("Max Value:", placeholder="Leave empty for no max")
-        solve_btn = self.create_button("🚀 Solve", self.colors["secondary"], 
+        self.solve_btn = self.create_button("🚀 Solve", self.colors["secondary"], 
                                     action=self.solve, tooltip="Solve the optimization problem")
+        self.cancel_btn = self.create_button("✖ Cancel", self.colors["warning"],
+                                    action=self.cancel_solve, tooltip="Stop the running solve")
+        self.cancel_btn.setEnabled(False)
         clear_btn = self.create_button("🧹 Clear All", self.colors["danger"], 
                                     action=self.clear_all, tooltip="Clear all inputs")
         action_card.layout().addWidget(self.demand_input)
         action_card.layout().addWidget(self.max_value_input)
-        action_card.layout().addWidget(solve_btn)
+        action_card.layout().addWidget(self.solve_btn)
+        action_card.layout().addWidget(self.cancel_btn)
         action_card.layout().addWidget(clear_btn)
         
         # Add all sidebar cards with stretch factors
@@ -196,6 +203,8 @@ class ResourceAllocator(QMainWindow):
             }}
         """)
         result_card.layout().addWidget(self.result_output)
+        self.stats_panel = StatsPanel()
+        result_card.layout().addWidget(self.stats_panel)
         
         # Error label
         self.error_label = QLabel()
@@ -389,10 +398,39 @@ class ResourceAllocator(QMainWindow):
             demand = float(self.demand_input.entry.text())
             max_value_text = self.max_value_input.entry.text().strip()
             max_value = float(max_value_text) if max_value_text else None
-            solver = ResourceSolver(self.costs, self.constraints, self.error_label, self.result_output, demand, max_value)
-            solver.solve()
+            solver = ResourceSolver(list(self.costs), list(self.constraints), self.error_label, self.result_output, demand, max_value,
+                                    self.stats_panel)
         except Exception as e:
             self.error_label.setText(str(e))
+            return
+
+        # Solve on a worker thread so the window stays responsive
+        self.worker = SolveWorker(solver.run, self)
+        self.worker.tick.connect(lambda elapsed: self.statusBar().showMessage(f"Solving... {elapsed:.1f} s"))
+        self.worker.succeeded.connect(solver.display)
+        self.worker.failed.connect(lambda e: self.error_label.setText(str(e)))
+        self.worker.finished.connect(self.on_solve_finished)
+        self.solve_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.worker.start()
+
+    def cancel_solve(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def on_solve_finished(self):
+        self.statusBar().showMessage(f"Solve finished in {self.worker.elapsed():.2f} s", 3000)
+        self.solve_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.worker.deleteLater()
+        self.worker = None
+
+    def closeEvent(self, event):
+        # Never leave a solve thread running behind a closed window
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
+        super().closeEvent(event)
 
     def clear_all(self):
        
@@ -0,0 +1,9 @@
+# Solve statistics shared by every solver, next to home.py; Qt-free, so the
+# headless cores can use it (stats_panel.StatsPanel displays the entries)
+
+
+def model_stats(model):
+    """Size and work counters of an optimized Gurobi model, as stats entries"""
+    return {'variables': model.NumVars, 'constraints': model.NumConstrs, 'nonzeros': model.NumNZs,
+            'runtime': model.Runtime, 'work': model.Work, 'nodes': int(model.NodeCount),
+            'iterations': int(model.IterCount)}
@@ -0,0 +1,55 @@
+import time
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
+
+
+class SolveWorker(QThread):
+    """Runs a solve task off the Qt main thread so the window stays responsive.
+
+    The task is called as task(worker) from the worker thread and must not
+    touch any widget; it may call worker.set_stop() with a callable that
+    interrupts the running solve (e.g. model.terminate) so Cancel can reach it.
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    tick = pyqtSignal(float)  # Elapsed seconds, emitted on the main thread
+
+    def __init__(self, task, parent=None, interval=100):
+        super().__init__(parent)
+        self.task = task
+        self.cancelled = False
+        self._stop = None
+        self._started_at = None
+        # The timer lives on the main thread, like the QThread object itself
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval)
+        self.timer.timeout.connect(lambda: self.tick.emit(self.elapsed()))
+        self.finished.connect(self.timer.stop)
+
+    def start(self):
+        self._started_at = time.perf_counter()
+        self.timer.start()
+        super().start()
+
+    def elapsed(self):
+        if self._started_at is None:
+            return 0.0
+        return time.perf_counter() - self._started_at
+
+    def set_stop(self, stop):
+        """Register how to interrupt the running solve"""
+        self._stop = stop
+        if self.cancelled:
+            stop()
+
+    def cancel(self):
+        self.cancelled = True
+        if self._stop is not None:
+            self._stop()
+
+    def run(self):
+        try:
+            result = self.task(self)
+        except Exception as e:
+            self.failed.emit(e)
+        else:
+            self.succeeded.emit(result)
@@ -0,0 +1,82 @@
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QLabel, QToolButton, QVBoxLayout, QWidget
+
+# Display names for the stats keys the solvers report, in display order;
+# keys not listed here are shown after them under their own name
+STAT_LABELS = {
+    'engine': "Engine",
+    'status': "Status",
+    'variables': "Variables",
+    'constraints': "Constraints",
+    'nonzeros': "Nonzeros",
+    'runtime': "Gurobi runtime (s)",
+    'work': "Gurobi work units",
+    'nodes': "B&B nodes",
+    'iterations': "Simplex iterations",
+    'settled': "Nodes settled",
+    'reset': "Tree nodes reset",
+    'pivots': "Network simplex pivots",
+    'relaxations': "Edge relaxations",
+    'gurobi_status': "Gurobi status code",
+    'cache': "Result cache",
+    'cache_hits': "Cache hits",
+    'cache_misses': "Cache misses",
+}
+
+
+def format_stats(stats, timings):
+    """Plain-text table of a solve's stats and phase timings"""
+    lines = []
+    keys = [key for key in STAT_LABELS if key in stats] + [key for key in stats if key not in STAT_LABELS]
+    for key in keys:
+        value = stats[key]
+        if isinstance(value, float):
+            value = f"{value:.4g}"
+        lines.append(f"{STAT_LABELS.get(key, key):<20} {value}")
+    if timings:
+        lines.append("")
+        lines.append("Phase timings")
+        for phase, seconds in timings.items():
+            if phase != 'total':
+                lines.append(f"  {phase:<18} {seconds * 1000:10.2f} ms")
+        if 'total' in timings:
+            lines.append(f"  {'total':<18} {timings['total'] * 1000:10.2f} ms")
+    return "\n".join(lines)
+
+
+class StatsPanel(QWidget):
+    """Collapsible "Solve statistics" section for a results area, showing
+    the stats and phase timings of the last solve"""
+
+    def __init__(self, parent=None, title="Solve statistics"):
+        super().__init__(parent)
+        self.toggle = QToolButton()
+        self.toggle.setText(title)
+        self.toggle.setCheckable(True)
+        self.toggle.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
+        self.toggle.setArrowType(Qt.RightArrow)
+        self.toggle.setStyleSheet("QToolButton { border: none; color: white; font-weight: bold; }")
+        self.toggle.toggled.connect(self.set_expanded)
+
+        self.body = QLabel()
+        self.body.setFont(QFont("Consolas"))
+        self.body.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.body.setStyleSheet("color: white; padding-left: 18px;")
+        self.body.setVisible(False)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.toggle)
+        layout.addWidget(self.body)
+        self.clear()
+
+    def set_expanded(self, expanded):
+        self.toggle.setArrowType(Qt.DownArrow if expanded else Qt.RightArrow)
+        self.body.setVisible(expanded)
+
+    def show_stats(self, stats, timings=None):
+        self.body.setText(format_stats(stats, timings or {}))
+
+    def clear(self):
+        self.body.setText("No solve yet.")
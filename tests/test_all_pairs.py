@@ -0,0 +1,42 @@
+import pytest
+from probleme1.all_pairs import AllPairsIndex
+from probleme1.generators import random_graph, with_negative_weights
+from probleme1.graph_core import Graph
+from probleme1.path_solver import ShortestPathSolver, SolveError
+
+
+def negative_edge_graph():
+    # a -> c -> b beats a -> b once the rebate on c -> b is counted
+    graph = Graph()
+    for u, v, w in (("a", "b", 1), ("b", "d", 5), ("a", "c", 4), ("c", "b", -8)):
+        graph.add_edge(u, v, w)
+    return graph
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_negative_edge(dense, monkeypatch):
+    if not dense:
+        monkeypatch.setattr("probleme1.all_pairs.FLOYD_WARSHALL_MAX_NODES", 0)
+    index = AllPairsIndex.build(negative_edge_graph())
+    assert index.path("a", "d") == (1.0, ["a", "c", "b", "d"])  # Not 6.0 via a -> b
+    assert index.path("d", "a") == (None, None)
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_negative_cycle(dense, monkeypatch):
+    if not dense:
+        monkeypatch.setattr("probleme1.all_pairs.FLOYD_WARSHALL_MAX_NODES", 0)
+    graph = negative_edge_graph()
+    graph.add_edge("b", "c", 1)
+    with pytest.raises(SolveError):
+        AllPairsIndex.build(graph)
+
+
+def test_matches_spfa_with_negative_weights():
+    graph = with_negative_weights(random_graph(600, seed=3), seed=3)
+    index = AllPairsIndex.build(graph, workers=1)
+    solver = ShortestPathSolver(graph, "spfa")
+    for start, end in (("N0", "N7"), ("N11", "N42"), ("N99", "N5")):
+        expected = solver.find_path(start, end).objective
+        cost, _ = index.path(start, end)
+        assert cost == pytest.approx(expected) if expected is not None else cost is None
@@ -0,0 +1,43 @@
+import numpy as np
+from probleme1.graph_core import Graph
+from probleme1.graph_io import load_layout, save_layout
+
+EDGES = [("a", "b", 1.0), ("b", "c", 2.5), ("c", "a", 4.0), ("a", "c", 3.0)]
+
+
+def build(edges):
+    graph = Graph()
+    for u, v, w in edges:
+        graph.add_edge(u, v, w)
+    return graph
+
+
+def test_content_hash_ignores_insertion_order():
+    assert build(EDGES).content_hash() == build(EDGES[::-1]).content_hash()
+
+
+def test_content_hash_after_add_and_remove():
+    graph = build(EDGES)
+    before = graph.content_hash()
+    graph.remove_edge("a", "b")  # The last edge moves into its slot
+    graph.add_edge("a", "b", 1.0)  # ... and this one goes last
+    assert graph.content_hash() == before
+
+
+def test_content_hash_sees_weights():
+    graph = build(EDGES)
+    before = graph.content_hash()
+    graph.add_edge("a", "b", 1.5)
+    assert graph.content_hash() != before
+
+
+def test_layout_needs_the_same_node_ids(tmp_path):
+    path = str(tmp_path / "graph.csv")
+    graph = build(EDGES)
+    positions = np.arange(6.0).reshape(3, 2)
+    save_layout(path, graph, positions)
+    assert np.array_equal(load_layout(path, build(EDGES)), positions)
+    # Same content, other ids: the positions would land on the wrong nodes
+    reordered = build(EDGES[::-1])
+    assert reordered.names != graph.names
+    assert load_layout(path, reordered) is None